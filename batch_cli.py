@@ -0,0 +1,263 @@
+"""
+Resolución por lotes sin interfaz gráfica: JSONL de entrada, JSONL de salida
+Cada línea de entrada es un objeto como los de ODESolver.solve_spec
+({"equation": ..., "method": ..., "initial_conditions": ...} o {"M": ..., "N": ...},
+con un "id" opcional). Las ecuaciones se resuelven en un pool de procesos con un
+número acotado de peticiones en vuelo y los resultados se escriben en el mismo
+orden que la entrada a medida que terminan, de modo que la memoria no crece con
+el tamaño del fichero.
+
+Cada línea de salida es {"line": n, "id": ..., "result": {...}} con el mismo
+diccionario de resultado que devuelve ODESolver. Con --checkpoint se guarda la
+última línea de entrada escrita (y la posición en el fichero de salida) y
+--resume continúa desde ese punto, descartando la salida posterior al checkpoint.
+
+Uso:
+    python batch_cli.py entregas.jsonl -o resultados.jsonl --workers 4
+    cat entregas.jsonl | python batch_cli.py - > resultados.jsonl
+    python batch_cli.py entregas.jsonl -o resultados.jsonl --checkpoint progreso.txt --resume
+"""
+
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ode_solver import ODESolver, _init_batch_worker, _solve_batch_item
+
+
+def _json_default(value):
+    # Resultados numéricos (arrays y escalares de NumPy)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+def read_records(stream, skip=0):
+    """
+    Genera (número de línea, spec o None, error) por cada línea no vacía
+    Las primeras skip líneas (ya procesadas) se saltan sin analizarlas.
+    """
+    for number, line in enumerate(stream, start=1):
+        if number <= skip:
+            continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, None, f'JSON no válido: {e}'
+            continue
+        if isinstance(record, str):
+            record = {'equation': record}
+        if not isinstance(record, dict):
+            yield number, None, 'Cada línea debe ser un objeto JSON o una cadena'
+            continue
+        yield number, record, None
+
+
+def read_checkpoint(path):
+    """
+    (última línea de entrada escrita, posición en bytes de la salida o None)
+    Sin checkpoint devuelve (0, None).
+    """
+    try:
+        with open(path, encoding='utf-8') as fh:
+            fields = fh.read().split()
+    except FileNotFoundError:
+        return 0, None
+    line = int(fields[0]) if fields else 0
+    offset = int(fields[1]) if len(fields) > 1 else None
+    return line, offset
+
+
+def write_checkpoint(path, line, offset=None):
+    # Escritura atómica: un fallo a mitad no deja el checkpoint corrupto
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        fh.write(f'{line}\n' if offset is None else f'{line} {offset}\n')
+    os.replace(tmp, path)
+
+
+def _output_offset(stream):
+    try:
+        return stream.tell()
+    except (OSError, ValueError):
+        # stdout o una tubería: solo se guarda la línea
+        return None
+
+
+class Progress:
+    """Contadores de la ejecución e informe periódico por stderr"""
+
+    def __init__(self, interval=5.0, stream=sys.stderr):
+        self.interval = interval
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.done = 0
+        self.solved = 0
+        self.failed = 0
+
+    def update(self, result):
+        self.done += 1
+        if result.get('success'):
+            self.solved += 1
+        else:
+            self.failed += 1
+        now = time.perf_counter()
+        if self.interval and now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.start
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    def report(self, final=False):
+        prefix = 'Terminado' if final else 'Progreso'
+        print(f"{prefix}: {self.done} ecuaciones ({self.solved} resueltas, {self.failed} con error) "
+              f"en {time.perf_counter() - self.start:.1f} s, {self.rate():.1f} ec/s",
+              file=self.stream, flush=True)
+
+
+def solve_stream(records, solver, method='general', workers=None, window=None):
+    """
+    Resuelve los registros en paralelo y genera (número de línea, registro, resultado)
+    en el orden de entrada. Como mucho window ecuaciones están en vuelo a la vez.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    def prepare(record):
+        spec = solver._normalize_spec(record, method)
+        spec.pop('id', None)
+        return spec
+
+    if workers <= 1:
+        for number, record, error in records:
+            if error is not None:
+                yield number, record, {'success': False, 'error': error}
+            else:
+                yield number, record, solver.solve_spec(prepare(record))
+        return
+
+    window = window or workers * 4
+    store_path = solver.store.path if solver.store is not None else None
+    pending = collections.deque()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_batch_worker,
+        initargs=(solver._cache.maxsize, store_path, solver.timeout,
+                  solver.simplify_steps, solver.simplify_budget)
+    ) as executor:
+        for number, record, error in records:
+            if error is not None:
+                pending.append((number, record, {'success': False, 'error': error}))
+            else:
+                pending.append((number, record, executor.submit(_solve_batch_item, prepare(record))))
+            while len(pending) >= window or (pending and _ready(pending[0][2])):
+                yield _resolve(pending.popleft())
+        while pending:
+            yield _resolve(pending.popleft())
+
+
+def _ready(value):
+    return isinstance(value, dict) or value.done()
+
+
+def _resolve(item):
+    number, record, value = item
+    if isinstance(value, dict):
+        return number, record, value
+    try:
+        return number, record, value.result()
+    except Exception as e:
+        return number, record, {'success': False, 'error': str(e), 'error_type': type(e).__name__}
+
+
+def run(input_stream, output_stream, solver, method='general', workers=None, window=None, skip=0,
+        checkpoint=None, checkpoint_every=100, progress=None):
+    """Procesa toda la entrada y devuelve el objeto Progress con los contadores"""
+    progress = progress or Progress(interval=0)
+    last_line = skip
+    results = solve_stream(read_records(input_stream, skip), solver, method, workers, window)
+    for number, record, result in results:
+        line = {'line': number}
+        if isinstance(record, dict) and 'id' in record:
+            line['id'] = record['id']
+        line['result'] = result
+        output_stream.write(json.dumps(line, ensure_ascii=False, default=_json_default) + '\n')
+        progress.update(result)
+        last_line = number
+        if checkpoint and progress.done % checkpoint_every == 0:
+            output_stream.flush()
+            write_checkpoint(checkpoint, last_line, _output_offset(output_stream))
+    output_stream.flush()
+    if checkpoint:
+        write_checkpoint(checkpoint, last_line, _output_offset(output_stream))
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolución por lotes de EDOs (JSONL -> JSONL)")
+    parser.add_argument('input', nargs='?', default='-', help="Fichero JSONL de entrada ('-' = stdin)")
+    parser.add_argument('-o', '--output', default='-', help="Fichero JSONL de salida ('-' = stdout)")
+    parser.add_argument('--method', default='general', help="Método si el registro no indica 'method'")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos (por defecto, uno por núcleo)")
+    parser.add_argument('--window', type=int, default=None, help="Ecuaciones en vuelo a la vez (por defecto 4 por proceso)")
+    parser.add_argument('--timeout', type=float, default=None, help="Tiempo máximo (s) por ecuación")
+    parser.add_argument('--store', default=None, help="Almacén SQLite de soluciones")
+    parser.add_argument('--skip', type=int, default=0, help="Saltar las primeras N líneas de la entrada")
+    parser.add_argument('--checkpoint', default=None, help="Fichero donde guardar la última línea escrita")
+    parser.add_argument('--checkpoint-every', type=int, default=100, help="Resultados entre checkpoints")
+    parser.add_argument('--resume', action='store_true', help="Continuar desde el checkpoint (añade a la salida)")
+    parser.add_argument('--progress', type=float, default=5.0, help="Segundos entre informes de progreso (0 = sin informe)")
+    args = parser.parse_args(argv)
+
+    skip = args.skip
+    offset = None
+    if args.resume:
+        if not args.checkpoint:
+            parser.error("--resume requiere --checkpoint")
+        line, offset = read_checkpoint(args.checkpoint)
+        skip = max(skip, line)
+        if skip:
+            print(f"Reanudando después de la línea {skip}", file=sys.stderr)
+
+    solver = ODESolver(store=args.store, timeout=args.timeout)
+    input_stream = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    if args.output == '-':
+        output_stream = sys.stdout
+    elif args.resume and os.path.exists(args.output):
+        # Se descartan los resultados escritos después del último checkpoint
+        output_stream = open(args.output, 'r+', encoding='utf-8')
+        output_stream.seek(0, os.SEEK_END)
+        if offset is not None:
+            output_stream.seek(offset)
+            output_stream.truncate()
+    else:
+        output_stream = open(args.output, 'w', encoding='utf-8')
+    progress = Progress(interval=args.progress)
+    try:
+        run(input_stream, output_stream, solver, method=args.method, workers=args.workers, window=args.window,
+            skip=skip, checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every, progress=progress)
+    except KeyboardInterrupt:
+        print("Interrumpido; use --resume para continuar desde el último checkpoint", file=sys.stderr)
+        return 130
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+        solver.close()
+    if args.progress:
+        progress.report(final=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
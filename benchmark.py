@@ -0,0 +1,322 @@
+"""
+Banco de pruebas de rendimiento del solucionador de ecuaciones diferenciales
+Mide por método y por fase (parseo, motores directos, clasificación, dsolve, simplificación,
+formato y renderizado LaTeX, según la instrumentación de ODESolver) con percentiles p50/p95 y permite guardar y
+comparar líneas base en JSON para detectar regresiones.
+
+Uso:
+    python benchmark.py                          # ejecutar y mostrar la tabla
+    python benchmark.py --save baseline.json     # guardar línea base
+    python benchmark.py --compare baseline.json  # comparar con una línea base
+    python benchmark.py --imports                # tiempos de importación frente al presupuesto
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import sympy as sp
+from sympy.core.cache import clear_cache as clear_sympy_cache
+
+import closed_form
+from ode_solver import ODESolver
+
+
+# Corpus por método: los ejemplos de la GUI más casos más exigentes
+CORPUS = {
+    'general': [
+        {'equation': "dy/dx = x*y"},
+        {'equation': "y' = x + y"},
+        {'equation': "dy/dx = x*y", 'initial_conditions': {'x0': 0, 'y0': 1}},
+    ],
+    'separable': [
+        {'equation': "dy/dx = x*y"},
+        {'equation': "y' = x/y"},
+        {'equation': "dy/dx = exp(x)*(1 + y**2)"},
+    ],
+    'homogeneous': [
+        {'equation': "dy/dx = (x+y)/x"},
+        {'equation': "y' = y/x + x/y"},
+        {'equation': "dy/dx = (x**2 + y**2)/(x*y)"},
+    ],
+    'exact': [
+        {'M': "2*x*y", 'N': "x**2 + 1"},
+        {'M': "3*x**2*y**2 + exp(x)", 'N': "2*x**3*y + cos(y)"},
+        {'M': "4*x**3*y**3 + 2*x*y**5 + 3*x**2", 'N': "3*x**4*y**2 + 5*x**2*y**4 + 2*y"},
+    ],
+    'linear': [
+        {'equation': "dy/dx + y = x"},
+        {'equation': "y' + 2*x*y = x**2"},
+        {'equation': "y' + y/x = sin(x)", 'initial_conditions': {'x0': 1, 'y0': 0}},
+    ],
+    'bernoulli': [
+        {'equation': "dy/dx + y = x*y**2"},
+        {'equation': "y' - y = x*y**3"},
+        {'equation': "x*y' + y = x**2*y**2"},
+    ],
+    'integrating_factor': [
+        {'M': "3*x**2 + y", 'N': "x**2*y - x"},
+        {'M': "x*y", 'N': "2*x**2 + 3*y**2 - 20"},
+    ],
+    'second_order_const': [
+        {'equation': "y'' - 3*y' + 2*y = 0"},
+        {'equation': "y'' + y = x"},
+        {'equation': "y'' + 4*y = 0"},
+        {'equation': "y'' - 2*y' + y = 0"},
+        {'equation': "4*y'' + 4*y' + 17*y = 0", 'initial_conditions': {'x0': 0, 'y0': -1, 'yp0': 2}},
+        {'equation': "y'' - 2*y' + y = x*exp(x)"},
+    ],
+    'reducible': [
+        {'equation': "y'' = x"},
+        {'equation': "y'' = y'**2"},
+    ],
+}
+
+# Presupuesto de tiempo de importación (ms, acumulado según python -X importtime)
+# de los puntos de entrada. Es holgado: casi todo el tiempo de gui_app es
+# customtkinter, que varía mucho de una máquina a otra
+IMPORT_BUDGET_MS = {
+    'gui_app': 600,
+    'latex_render': 150,
+    'solve_cache': 150,
+    'solve_server': 500,
+    'ode_solver': 2500,
+}
+
+# Paquetes que cada punto de entrada no debe cargar al importarse (independiente
+# de la máquina): gui_app no carga SymPy ni matplotlib antes de mostrar la ventana
+# (PIL sí: lo importa customtkinter)
+IMPORT_FORBIDDEN = {
+    'gui_app': ('sympy', 'matplotlib', 'numpy'),
+    'latex_render': ('sympy', 'matplotlib', 'numpy', 'PIL'),
+    'solve_cache': ('sympy',),
+    'solve_server': ('sympy', 'matplotlib'),
+}
+
+PHASES = ('parse', 'special_cases', 'engine', 'classify', 'dsolve', 'simplify', 'integrate', 'format',
+          'latex', 'latex_render', 'total')
+
+
+def percentile(values, q):
+    """Percentil por rango más cercano (q entre 0 y 100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _timed(timings, phase, func):
+    # Vaciar la caché interna de SymPy para medir cada fase en frío
+    clear_sympy_cache()
+    start = time.perf_counter()
+    value = func()
+    timings.setdefault(phase, []).append(time.perf_counter() - start)
+    return value
+
+
+def _load_renderer():
+    try:
+        from latex_render import LatexRenderer
+    except ImportError:
+        return None
+    return LatexRenderer(cache_size=0)
+
+
+def measure_spec(solver, method, spec, timings, renderer=None):
+    """
+    Mide una ecuación del corpus sin pasar por las cachés
+    Las duraciones por fase salen de la instrumentación del solver (result['timings'])
+    """
+    clear_sympy_cache()
+    solver.clear_cache()
+    closed_form.clear_integral_cache()
+    result = solver.solve_spec(dict(spec, method=method))
+    for phase, seconds in result.get('timings', {}).items():
+        timings.setdefault(phase, []).append(seconds)
+
+    if renderer is not None and result.get('success'):
+        latex_text = result.get('solution_latex') or result.get('solution')
+        _timed(timings, 'latex_render', lambda: renderer._draw(latex_text, 'dark'))
+
+
+def run(methods=None, repeats=3, render=True, verbose=True):
+    """Ejecuta el corpus y devuelve {'meta': ..., 'results': {método: {fase: {p50, p95, n}}}}"""
+    solver = ODESolver(cache_size=0)
+    renderer = _load_renderer() if render else None
+    results = {}
+    for method, specs in CORPUS.items():
+        if methods and method not in methods:
+            continue
+        timings = {}
+        for _ in range(repeats):
+            for spec in specs:
+                measure_spec(solver, method, spec, timings, renderer)
+        results[method] = {
+            phase: {
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'n': len(values)
+            }
+            for phase, values in timings.items()
+        }
+        if verbose:
+            print(f"  {method}: {results[method]['total']['p50'] * 1000:.1f} ms (p50 total)", file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'sympy': sp.__version__,
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': results
+    }
+
+
+def import_profile(module):
+    """(tiempo de importación acumulado en s, paquetes de primer nivel cargados) de module en un intérprete nuevo"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}: {proc.stderr.strip().splitlines()[-1]}")
+    # Formato: "import time: <propio> | <acumulado> | <módulo>" (microsegundos)
+    seconds = None
+    packages = set()
+    for line in proc.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) != 3 or not fields[0].startswith('import time:'):
+            continue
+        packages.add(fields[2].strip().split('.')[0])
+        if fields[2].strip() == module and fields[2].startswith(' ' + module):
+            seconds = int(fields[1]) / 1e6
+    if seconds is None:
+        raise RuntimeError(f"python -X importtime no informó de {module}")
+    return seconds, packages
+
+
+def import_seconds(module):
+    """Tiempo de importación acumulado (s) de module en un intérprete nuevo"""
+    return import_profile(module)[0]
+
+
+def measure_imports(budgets=IMPORT_BUDGET_MS, forbidden=IMPORT_FORBIDDEN, repeats=3):
+    """{módulo: {p50, p95, n, budget, forbidden}} con los tiempos en segundos"""
+    results = {}
+    for module, budget_ms in budgets.items():
+        samples = []
+        loaded = set()
+        for _ in range(repeats):
+            seconds, packages = import_profile(module)
+            samples.append(seconds)
+            loaded |= packages
+        results[module] = {
+            'p50': percentile(samples, 50),
+            'p95': percentile(samples, 95),
+            'n': len(samples),
+            'budget': budget_ms / 1000,
+            'forbidden': sorted(loaded & set(forbidden.get(module, ())))
+        }
+    return results
+
+
+def format_import_table(imports):
+    lines = [f"{'módulo':<20}{'p50 ms':>12}{'p95 ms':>12}{'presupuesto':>14}  paquetes prohibidos"]
+    for module, stats in imports.items():
+        mark = '' if stats['p50'] <= stats['budget'] else '  ⚠️'
+        lines.append(f"{module:<20}{stats['p50'] * 1000:>12.1f}{stats['p95'] * 1000:>12.1f}"
+                     f"{stats['budget'] * 1000:>14.0f}  {', '.join(stats['forbidden']) or '-'}{mark}")
+    return '\n'.join(lines)
+
+
+def format_table(report):
+    lines = []
+    header = f"{'método':<20}" + ''.join(f"{phase:>15}" for phase in PHASES)
+    lines.append(header)
+    lines.append(f"{'':<20}" + ''.join(f"{'p50/p95 ms':>15}" for _ in PHASES))
+    for method, phases in report['results'].items():
+        row = f"{method:<20}"
+        for phase in PHASES:
+            stats = phases.get(phase)
+            cell = f"{stats['p50'] * 1000:.1f}/{stats['p95'] * 1000:.1f}" if stats else '-'
+            row += f"{cell:>15}"
+        lines.append(row)
+    return '\n'.join(lines)
+
+
+def compare(report, baseline, threshold=0.25):
+    """Lista de regresiones (p50 más de threshold por encima de la línea base)"""
+    regressions = []
+    for method, phases in report['results'].items():
+        for phase, stats in phases.items():
+            base = baseline.get('results', {}).get(method, {}).get(phase)
+            if not base or not base.get('p50'):
+                continue
+            ratio = stats['p50'] / base['p50']
+            if ratio > 1 + threshold:
+                regressions.append({
+                    'method': method,
+                    'phase': phase,
+                    'baseline_ms': base['p50'] * 1000,
+                    'current_ms': stats['p50'] * 1000,
+                    'ratio': ratio
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del solucionador de EDOs")
+    parser.add_argument('--methods', nargs='*', help="Métodos a medir (por defecto todos)")
+    parser.add_argument('--repeats', type=int, default=3, help="Repeticiones por ecuación")
+    parser.add_argument('--no-render', action='store_true', help="No medir el renderizado LaTeX")
+    parser.add_argument('--save', metavar='JSON', help="Guardar el resultado como línea base")
+    parser.add_argument('--compare', metavar='JSON', help="Comparar con una línea base")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Tolerancia de regresión (0.25 = 25%%)")
+    parser.add_argument('--imports', action='store_true',
+                        help="Medir solo los tiempos de importación frente a IMPORT_BUDGET_MS")
+    args = parser.parse_args(argv)
+
+    if args.imports:
+        imports = measure_imports(repeats=args.repeats)
+        print(format_import_table(imports))
+        over = [module for module, stats in imports.items() if stats['p50'] > stats['budget']]
+        heavy = [module for module, stats in imports.items() if stats['forbidden']]
+        if heavy:
+            print(f"\n⚠️ Cargan paquetes pesados al importarse: {', '.join(heavy)}")
+        if over:
+            print(f"\n⚠️ Por encima del presupuesto de importación: {', '.join(over)}")
+        if heavy or over:
+            return 1
+        print("\n✅ Importaciones dentro del presupuesto")
+        return 0
+
+    report = run(methods=args.methods, repeats=args.repeats, render=not args.no_render)
+    print(format_table(report))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+        print(f"\nLínea base guardada en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n⚠️ Regresiones (> {args.threshold:.0%} sobre la línea base, sympy {baseline['meta']['sympy']}):")
+            for r in regressions:
+                print(f"  {r['method']:<20} {r['phase']:<14} {r['baseline_ms']:9.1f} ms -> {r['current_ms']:9.1f} ms (x{r['ratio']:.2f})")
+            return 1
+        print("\n✅ Sin regresiones respecto a la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,779 @@
+"""
+Motores de solución en forma cerrada para clases frecuentes de EDOs
+Resuelven directamente (sin classify_ode ni dsolve) las ecuaciones lineales de
+coeficientes constantes de orden n mediante el polinomio característico, las
+lineales de primer orden con el factor integrante, las de Bernoulli con el
+cambio v = y^(1-n), las homogéneas con v = y/x y las exactas M dx + N dy = 0
+(incluida la búsqueda de factores integrantes).
+Cada motor devuelve None cuando la ecuación no encaja en su clase, para que el
+llamador recurra a dsolve.
+"""
+
+import random
+import time
+
+import sympy as sp
+from sympy import Eq, diff, exp, cos, sin, log
+from sympy.integrals.rationaltools import ratint
+
+from solve_cache import LRUCache
+
+
+# Integrales indefinidas ya calculadas, compartidas por todos los motores
+_integrals = LRUCache(512)
+
+
+def constants(n):
+    """Constantes de integración C1..Cn (los mismos símbolos que usa dsolve)"""
+    return list(sp.symbols(f'C1:{n + 1}')) if n else []
+
+
+def order_of(expr, f):
+    """Orden de la derivada más alta de f que aparece en expr"""
+    return max((d.derivative_count for d in expr.atoms(sp.Derivative) if d.expr == f), default=0)
+
+
+def linear_coefficients(expr, x, f, order):
+    """
+    Escribe expr como a_n·f^(n) + ... + a_0·f - g(x)
+    Devuelve ([a_0, ..., a_n], g) o None si expr no es lineal en f y sus derivadas.
+    """
+    derivatives = [f] + [sp.Derivative(f, (x, k)) for k in range(1, order + 1)]
+    dummies = sp.symbols(f'_d0:{order + 1}', cls=sp.Dummy)
+    flat = sp.expand(expr.xreplace(dict(zip(derivatives, dummies))))
+    if flat.has(f.func):
+        return None
+    try:
+        poly = sp.Poly(flat, *dummies)
+    except sp.PolynomialError:
+        return None
+    if poly.total_degree() > 1:
+        return None
+    coeffs = [poly.coeff_monomial(d) for d in dummies]
+    g = -poly.coeff_monomial(1)
+    if any(c.has(*dummies) for c in coeffs) or g.has(*dummies):
+        return None
+    return coeffs, g
+
+
+def integral(expr, x):
+    """
+    Primitiva de expr respecto de x (memoizada)
+    Devuelve None si SymPy no encuentra una forma cerrada.
+    """
+    key = (expr, x)
+    result = _integrals.get(key)
+    if result is None:
+        result = _integrate(expr, x)
+        _integrals.put(key, result)
+    if result.has(sp.Integral):
+        return None
+    return result
+
+
+# Pasos de simplificación disponibles (todos mucho más baratos que simplify),
+# de menor a mayor coste típico
+SIMPLIFY_STEPS = {
+    'logcombine': sp.logcombine,
+    'radsimp': sp.radsimp,
+    'powsimp': sp.powsimp,
+    'cancel': sp.cancel,
+    'ratsimp': sp.ratsimp,
+    'trigsimp': sp.trigsimp,
+}
+
+# Los pasos baratos van primero para que el presupuesto alcance a la mayoría
+DEFAULT_SIMPLIFY_PIPELINE = ('logcombine', 'powsimp', 'ratsimp')
+
+
+def simplify_bounded(expr, steps=DEFAULT_SIMPLIFY_PIPELINE, budget=0.5, measure=sp.count_ops):
+    """
+    Simplificación acotada: aplica los pasos en orden y conserva cada resultado
+    solo si no empeora la medida; deja de aplicar pasos al agotar budget segundos
+    Las igualdades y listas se simplifican miembro a miembro.
+    La cota es orientativa: el tiempo se comprueba entre pasos y un paso ya
+    empezado no se interrumpe, así que el total puede superar budget en lo que
+    dure el último paso. El límite estricto es el de ODESolver(timeout=...), que
+    termina el subproceso trabajador.
+    """
+    if isinstance(expr, (list, tuple)):
+        return type(expr)(simplify_bounded(e, steps, budget, measure) for e in expr)
+    if isinstance(expr, sp.Equality):
+        return Eq(simplify_bounded(expr.lhs, steps, budget, measure),
+                  simplify_bounded(expr.rhs, steps, budget, measure))
+    deadline = time.perf_counter() + budget
+    best, best_size = expr, measure(expr)
+    for name in steps:
+        if time.perf_counter() > deadline:
+            break
+        step = SIMPLIFY_STEPS[name] if isinstance(name, str) else name
+        try:
+            candidate = step(best)
+        except (sp.PolynomialError, NotImplementedError):
+            continue
+        size = measure(candidate)
+        if size <= best_size:
+            best, best_size = candidate, size
+    return best
+
+
+def _integrate(expr, x):
+    # Rutinas específicas para polinomios y funciones racionales en x (los demás
+    # símbolos actúan como parámetros); el resto pasa por integrate
+    if expr.is_polynomial(x):
+        return sp.Poly(expr, x).integrate().as_expr()
+    if expr.is_rational_function(x):
+        return ratint(expr, x, real=True)
+    # conds='none': caso genérico, sin Piecewise sobre los parámetros
+    return sp.integrate(expr, x, conds='none')
+
+
+def integral_cache_info():
+    return _integrals.info()
+
+
+def clear_integral_cache():
+    _integrals.clear()
+
+
+def equal_fast(a, b, variables, samples=3, seed=2024):
+    """
+    Decide si a == b de la forma más barata posible
+    Devuelve (iguales, método): forma normal polinómica o racional cuando se puede,
+    evaluación en puntos aleatorios en otro caso y simplify solo si la evaluación
+    numérica no es concluyente.
+    """
+    difference = a - b
+    if difference == 0:
+        return True, 'structural'
+    if difference.is_polynomial(*variables):
+        return sp.Poly(difference, *variables).is_zero, 'polynomial'
+    if difference.is_rational_function(*variables):
+        return sp.expand(sp.together(difference).as_numer_denom()[0]) == 0, 'rational'
+
+    rng = random.Random(seed)
+    conclusive = True
+    for _ in range(samples):
+        point = {v: sp.Rational(rng.randint(107, 1993), 1000) for v in variables}
+        va, vb = (sp.sympify(e).evalf(30, subs=point) for e in (a, b))
+        if not (va.is_number and vb.is_number) or va.has(sp.nan, sp.zoo) or vb.has(sp.nan, sp.zoo):
+            conclusive = False
+            continue
+        scale = max(1, abs(va), abs(vb))
+        if abs(va - vb) > 1e-15 * scale:
+            return False, 'numeric'
+    if conclusive:
+        return True, 'numeric'
+    return sp.simplify(difference) == 0, 'simplify'
+
+
+def apply_ics(rhs, x, ics, unknowns):
+    """Sustituye las condiciones iniciales y despeja las constantes (sistema lineal)"""
+    if not ics:
+        return rhs
+    equations = []
+    for point, value in ics.items():
+        if isinstance(point, sp.Subs):
+            derivative, _, (x0,) = point.args
+            k = derivative.derivative_count
+            equations.append(diff(rhs, x, k).subs(x, x0) - value)
+        else:
+            equations.append(rhs.subs(x, point.args[0]) - value)
+    used = [c for c in unknowns if any(eq.has(c) for eq in equations)]
+    solutions = sp.linsolve(equations, used)
+    if not solutions:
+        raise ValueError("Las condiciones iniciales no son compatibles con la solución")
+    values = dict(zip(used, next(iter(solutions))))
+    return rhs.subs(values)
+
+
+# ---------------------------------------------------------------------------
+# Coeficientes constantes de orden n: a_n y^(n) + ... + a_1 y' + a_0 y = g(x)
+# ---------------------------------------------------------------------------
+
+def _characteristic_roots(coeffs):
+    """Raíces del polinomio característico con multiplicidad, o None si no son explícitas"""
+    r = sp.Dummy('r')
+    poly = sp.Poly(sum(c * r**k for k, c in enumerate(coeffs)), r)
+    roots = sp.roots(poly)
+    if sum(roots.values()) != poly.degree():
+        return None
+    return roots
+
+
+def _homogeneous_basis(roots, x):
+    """
+    Base de soluciones de la homogénea:
+    raíz real r de multiplicidad m -> x^j e^{rx}; par α ± iβ -> x^j e^{αx} cos βx, x^j e^{αx} sin βx
+    """
+    basis = []
+    for root, multiplicity in sorted(roots.items(), key=lambda item: sp.default_sort_key(item[0])):
+        re_part, im_part = root.as_real_imag()
+        if im_part == 0:
+            basis.extend(x**j * exp(root * x) for j in range(multiplicity))
+        elif im_part.is_positive:
+            for j in range(multiplicity):
+                basis.append(x**j * exp(re_part * x) * cos(im_part * x))
+                basis.append(x**j * exp(re_part * x) * sin(im_part * x))
+        elif im_part.is_negative:
+            continue
+        else:
+            # Parte imaginaria de signo desconocido (parámetros simbólicos)
+            basis.extend(x**j * exp(root * x) for j in range(multiplicity))
+    return basis
+
+
+def _forcing_terms(g, x):
+    """
+    Descompone g(x) en términos p(x)·e^{ax}·{cos, sin}(bx)
+    Devuelve {(a, b): grado máximo de p} o None si algún término no tiene esa forma.
+    """
+    terms = {}
+    for term in sp.Add.make_args(sp.expand(sp.powsimp(g))):
+        a = b = sp.S.Zero
+        degree = 0
+        trig = False
+        for factor in sp.Mul.make_args(term):
+            if not factor.has(x):
+                continue
+            base, power = factor.as_base_exp()
+            if isinstance(factor, sp.exp) or base == sp.E:
+                rate = sp.expand(factor.args[0] if isinstance(factor, sp.exp) else power)
+                if not rate.is_polynomial(x) or sp.degree(rate, x) != 1 or rate.subs(x, 0) != 0:
+                    return None
+                a += rate.coeff(x)
+            elif isinstance(factor, (sin, cos)) and not trig:
+                arg = sp.expand(factor.args[0])
+                if not arg.is_polynomial(x) or sp.degree(arg, x) != 1 or arg.subs(x, 0) != 0:
+                    return None
+                b = sp.Abs(arg.coeff(x))
+                trig = True
+            elif base == x and power.is_Integer and power > 0:
+                degree += int(power)
+            else:
+                return None
+        key = (a, b)
+        terms[key] = max(terms.get(key, 0), degree)
+    return terms
+
+
+def _undetermined_coefficients(coeffs, roots, g, x):
+    """Solución particular por coeficientes indeterminados, o None si g no es de la familia"""
+    terms = _forcing_terms(g, x)
+    if terms is None:
+        return None
+
+    def operator(u):
+        return sum(c * diff(u, x, k) for k, c in enumerate(coeffs) if c != 0)
+
+    unknowns = []
+    trial = sp.S.Zero
+    for (a, b), degree in terms.items():
+        # Multiplicidad de a + ib como raíz característica (resonancia)
+        s = roots.get(a + sp.I * b, 0)
+        for part in ((cos, sin) if b != 0 else (None,)):
+            c = sp.symbols(f'_A{len(unknowns)}:{len(unknowns) + degree + 1}', cls=sp.Dummy)
+            unknowns.extend(c)
+            factor = exp(a * x) * (part(b * x) if part is not None else 1)
+            trial += x**s * sum(ck * x**k for k, ck in enumerate(c)) * factor
+
+    residual = sp.expand(sp.powsimp(sp.expand(operator(trial) - g)))
+    # Cada e^{ax}·{cos, sin}(bx) distinto pasa a ser un generador independiente
+    functions = sorted(residual.atoms(sp.exp, sin, cos), key=sp.default_sort_key)
+    generators = sp.symbols(f'_g0:{len(functions)}', cls=sp.Dummy)
+    try:
+        poly = sp.Poly(residual.xreplace(dict(zip(functions, generators))), x, *generators)
+    except sp.PolynomialError:
+        return None
+    solutions = sp.linsolve(poly.coeffs(), unknowns)
+    if not solutions:
+        return None
+    values = dict(zip(unknowns, next(iter(solutions))))
+    particular = trial.subs(values)
+    if particular.has(*unknowns):
+        return None
+    return sp.expand(particular)
+
+
+def _variation_of_parameters(coeffs, basis, g, x):
+    """Solución particular por variación de parámetros (None si alguna integral no cierra)"""
+    n = len(basis)
+    wronskian = sp.Matrix([[diff(b, x, i) for b in basis] for i in range(n)])
+    w = sp.simplify(wronskian.det())
+    if w == 0:
+        return None
+    forcing = g / coeffs[-1]
+    particular = sp.S.Zero
+    for i, b in enumerate(basis):
+        column = wronskian.copy()
+        column[:, i] = sp.Matrix([0] * (n - 1) + [1])
+        integrand = sp.simplify(column.det() * forcing / w)
+        primitive = integral(integrand, x)
+        if primitive is None:
+            return None
+        particular += b * primitive
+    # Las primitivas de funciones especiales (Ei, li...) pueden traer exp_polar, que
+    # unpolarify no quita de los argumentos de funciones con ramas: se sustituye por exp
+    particular = sp.unpolarify(particular).replace(sp.exp_polar, sp.exp)
+    return sp.trigsimp(sp.expand(particular))
+
+
+def solve_constant_coefficients(eq, x, f, ics=None):
+    """
+    Resuelve a_n y^(n) + ... + a_0 y = g(x) con a_k constantes
+    Devuelve {'solution', 'order', 'roots', 'homogeneous', 'particular_method'} o
+    None si la ecuación no es de esta clase o el polinomio no tiene raíces explícitas.
+    """
+    expr = eq.lhs - eq.rhs
+    order = order_of(expr, f)
+    if order == 0:
+        return None
+    matched = linear_coefficients(expr, x, f, order)
+    if matched is None:
+        return None
+    coeffs, g = matched
+    if coeffs[-1] == 0 or any(c.has(x) for c in coeffs):
+        return None
+
+    roots = _characteristic_roots(coeffs)
+    if roots is None:
+        return None
+    basis = _homogeneous_basis(roots, x)
+    unknowns = constants(order)
+    homogeneous = sum(c * b for c, b in zip(unknowns, basis))
+
+    particular_method = None
+    particular = sp.S.Zero
+    if g != 0:
+        particular = _undetermined_coefficients(coeffs, roots, g, x)
+        particular_method = 'undetermined_coefficients'
+        if particular is None:
+            particular = _variation_of_parameters(coeffs, basis, g, x)
+            particular_method = 'variation_of_parameters'
+        if particular is None:
+            return None
+
+    rhs = apply_ics(homogeneous + particular, x, ics, unknowns)
+    return {
+        'solution': Eq(f, rhs),
+        'order': order,
+        'roots': {str(root): multiplicity for root, multiplicity in roots.items()},
+        'homogeneous': g == 0,
+        'particular_method': particular_method
+    }
+
+
+# ---------------------------------------------------------------------------
+# Lineal de primer orden: y' + P(x) y = Q(x)
+# ---------------------------------------------------------------------------
+
+def linear_first_order_parts(eq, x, f):
+    """(P, Q) de y' + P(x)·y = Q(x), o None si la ecuación no es lineal de primer orden"""
+    expr = eq.lhs - eq.rhs
+    if order_of(expr, f) != 1:
+        return None
+    matched = linear_coefficients(expr, x, f, 1)
+    if matched is None:
+        return None
+    (a0, a1), g = matched
+    if a1 == 0:
+        return None
+    return sp.cancel(a0 / a1), sp.cancel(g / a1)
+
+
+def _distribute(expr):
+    # (∫μQ + C1)/μ deja μ sin simplificar contra la integral: se reparte solo si
+    # así la expresión se acorta (C1·e^(-x) + x - 1 frente a (C1 + (x-1)e^x)e^(-x))
+    candidate = sp.powsimp(sp.expand(expr))
+    return candidate if sp.count_ops(candidate) < sp.count_ops(expr) else expr
+
+
+def solve_linear_parts(P, Q, x, f, ics=None):
+    """
+    y = (∫μQ dx + C1)/μ con μ = exp(∫P dx)
+    Devuelve el dict del motor o None si alguna integral no tiene forma cerrada.
+    """
+    integral_P = integral(P, x) if P != 0 else sp.S.Zero
+    if integral_P is None:
+        return None
+    mu = sp.powsimp(exp(integral_P))
+    integral_muQ = integral(sp.powsimp(sp.expand(mu * Q)), x) if Q != 0 else sp.S.Zero
+    if integral_muQ is None:
+        return None
+    C1, = constants(1)
+    rhs = apply_ics(_distribute((integral_muQ + C1) / mu), x, ics, [C1])
+    return {
+        'solution': Eq(f, rhs),
+        'P': P,
+        'Q': Q,
+        'integrating_factor': mu,
+        'homogeneous': Q == 0
+    }
+
+
+def solve_first_order_linear(eq, x, f, ics=None):
+    """Resuelve y' + P(x)·y = Q(x) con el factor integrante (None si no es de esta clase)"""
+    parts = linear_first_order_parts(eq, x, f)
+    if parts is None:
+        return None
+    P, Q = parts
+    if P.has(f) or Q.has(f):
+        return None
+    return solve_linear_parts(P, Q, x, f, ics)
+
+
+# ---------------------------------------------------------------------------
+# Bernoulli: y' + P(x) y = Q(x) y^n, con v = y^(1-n)
+# ---------------------------------------------------------------------------
+
+def explicit_slope(eq, x, f):
+    """F(x, y) tal que la ecuación equivale a y' = F(x, y), o None si no es de primer orden en y'"""
+    expr = eq.lhs - eq.rhs
+    if order_of(expr, f) != 1:
+        return None
+    yp = sp.Derivative(f, x)
+    d = sp.Dummy('d')
+    flat = sp.expand(expr.xreplace({yp: d}))
+    a1 = flat.coeff(d, 1)
+    rest = flat.coeff(d, 0)
+    if a1 == 0 or a1.has(f) or sp.expand(a1 * d + rest - flat) != 0:
+        return None
+    return -rest / a1
+
+
+def bernoulli_parts(eq, x, f, n=None):
+    """
+    (P, Q, n) de y' + P(x)·y = Q(x)·y^n, o None si la ecuación no es de Bernoulli
+    n se detecta a partir de las potencias de y, o se comprueba si se indica.
+    """
+    F = explicit_slope(eq, x, f)
+    if F is None:
+        return None
+    by_power = {}
+    for term in sp.Add.make_args(sp.expand(sp.powsimp(F))):
+        coeff, ypart = term.as_independent(f, as_Add=False)
+        base, power = ypart.as_base_exp()
+        if ypart == 1:
+            power = sp.S.Zero
+        elif base != f:
+            return None
+        by_power[power] = by_power.get(power, sp.S.Zero) + coeff
+    if n is None:
+        others = [p for p in by_power if p != 1]
+        if len(others) != 1:
+            return None
+        n = others[0]
+    n = sp.sympify(n)
+    if n in (0, 1) or set(by_power) - {sp.S.One, n}:
+        return None
+    P = sp.cancel(-by_power.get(sp.S.One, 0))
+    Q = sp.cancel(by_power.get(n, 0))
+    if Q == 0 or P.has(f) or Q.has(f):
+        return None
+    return P, Q, n
+
+
+def solve_bernoulli(eq, x, f, ics=None, n=None):
+    """
+    Resuelve la ecuación de Bernoulli con v = y^(1-n):  v' + (1-n)P·v = (1-n)Q
+    La lineal en v se resuelve con el factor integrante y se deshace el cambio.
+    Si 1/(1-n) tiene denominador par hay dos ramas reales, y = ±v^(1/(1-n)): sin
+    condiciones iniciales se devuelven ambas (como dsolve) y con ellas la del signo
+    de y0. Devuelve None si las condiciones no se pueden trasladar a v (derivadas,
+    y0 <= 0 con exponente no entero), para que se resuelva con dsolve.
+    """
+    parts = bernoulli_parts(eq, x, f, n)
+    if parts is None:
+        return None
+    P, Q, n = parts
+    k = 1 - n
+    power = 1 / k
+    even = power.is_Rational and not power.is_integer and power.q % 2 == 0
+    sign = 1
+    if ics:
+        if len(ics) != 1 or any(isinstance(point, sp.Subs) for point in ics):
+            return None
+        (point, value), = ics.items()
+        value = sp.sympify(value)
+        if not (value.is_positive or (value.is_negative and k.is_integer)):
+            return None
+        # v = y^(1-n) puede perder el signo de y0: se recupera al elegir la rama
+        sign = -1 if value.is_negative else 1
+        ics = {point: value**k}
+    linear = solve_linear_parts(sp.expand(k * P), sp.expand(k * Q), x, f)
+    if linear is None:
+        return None
+    v = linear['solution'].rhs
+    if ics:
+        v = apply_ics(v, x, ics, constants(1))
+    if sign > 0 or power.is_integer:
+        rhs = sp.powsimp(v**power)
+    elif even:
+        rhs = -sp.powsimp(v**power)
+    else:
+        # Raíz de índice impar de v < 0: la rama real es -(-v)^(1/k)
+        rhs = -sp.powsimp((-v)**power)
+    if k == -1:
+        rhs = sp.cancel(rhs)
+    solution = Eq(f, rhs)
+    if even and sign > 0 and not ics:
+        solution = [Eq(f, -rhs), solution]
+    return {
+        'solution': solution,
+        'n': n,
+        'P': P,
+        'Q': Q,
+        'integrating_factor': linear['integrating_factor']
+    }
+
+
+# ---------------------------------------------------------------------------
+# Homogéneas: y' = F(y/x), con v = y/x  ->  x v' = F(v) - v (separable)
+# ---------------------------------------------------------------------------
+
+def homogeneous_slope(eq, x, f):
+    """G(v) tal que y' = G(y/x), o None si la ecuación no es homogénea de grado 0"""
+    F = explicit_slope(eq, x, f)
+    if F is None:
+        return None, None
+    v = sp.Dummy('v')
+    G = sp.powsimp(sp.cancel(F.subs(f, v * x)), force=True)
+    if G.has(x):
+        G = sp.cancel(sp.expand_power_base(G, force=True))
+    if G.has(x):
+        return None, None
+    return G, v
+
+
+def solve_homogeneous(eq, x, f, ics=None):
+    """
+    Resuelve y' = G(y/x): con v = y/x la ecuación es separable y
+    ∫ dv / (G(v) - v) = log(x) + C1; se intenta despejar v y se deshace el cambio
+    """
+    G, v = homogeneous_slope(eq, x, f)
+    if G is None:
+        return None
+    if ics:
+        # Solo se admite y(x0) = y0 con x0 != 0 (la forma implícita usa y0/x0 y log(x0));
+        # con otras condiciones se resuelve con dsolve
+        if len(ics) != 1 or any(isinstance(point, sp.Subs) for point in ics):
+            return None
+        (point, value), = ics.items()
+        x0 = point.args[0]
+        if x0 == 0:
+            return None
+    C1, = constants(1)
+    denominator = sp.cancel(G - v)
+    if denominator == 0:
+        # y' = y/x: rectas por el origen
+        solutions = [Eq(f, C1 * x)]
+        implicit = None
+    else:
+        H = integral(sp.cancel(1 / denominator), v)
+        if H is None:
+            return None
+        implicit = Eq(H.subs(v, f / x), log(x) + C1)
+        try:
+            explicit = sp.solve(Eq(H, log(x) + C1), v)
+        except NotImplementedError:
+            explicit = []
+        solutions = [Eq(f, x * root) for root in explicit] or [implicit]
+
+    if ics:
+        # C1 se obtiene directamente de la forma implícita H(y0/x0) = log(x0) + C1
+        if implicit is None:
+            c_value = value / x0
+        else:
+            c_value = sp.simplify(H.subs(v, value / x0) - log(x0))
+        solutions = [s.subs(C1, c_value) for s in solutions]
+        consistent = [s for s in solutions if s.lhs != f or sp.simplify(s.rhs.subs(x, x0) - value) == 0]
+        solutions = consistent or solutions
+
+    return {
+        'solution': solutions[0] if len(solutions) == 1 else solutions,
+        'substitution': 'v = y/x',
+        'reduced': Eq(x * sp.Derivative(sp.Function('v')(x), x), denominator.subs(v, sp.Function('v')(x))),
+        'implicit': implicit,
+        'explicit': bool(solutions) and solutions[0].lhs == f
+    }
+
+
+# ---------------------------------------------------------------------------
+# Exactas: M(x, y) dx + N(x, y) dy = 0 con ∂M/∂y = ∂N/∂x
+# ---------------------------------------------------------------------------
+
+def _cheap_normal_form(expr, variables, steps=None):
+    if expr.is_polynomial(*variables):
+        return sp.expand(expr)
+    if expr.is_rational_function(*variables):
+        return sp.cancel(expr)
+    if steps:
+        return simplify_bounded(expr, steps)
+    return expr
+
+
+def potential_function(M, N, x, y):
+    """
+    F(x, y) con ∂F/∂x = M y ∂F/∂y = N (se supone la ecuación exacta)
+    Devuelve None si alguna integral no tiene forma cerrada.
+    """
+    F = integral(M, x)
+    if F is None:
+        return None
+    g_prime = _cheap_normal_form(N - diff(F, y), (x, y))
+    if g_prime.has(x):
+        g_prime = sp.simplify(g_prime)
+        if g_prime.has(x):
+            return None
+    G = integral(g_prime, y) if g_prime != 0 else sp.S.Zero
+    if G is None:
+        return None
+    return _cheap_normal_form(F + G, (x, y), steps=('logcombine', 'powsimp', 'trigsimp'))
+
+
+def solve_exact(M, N, x, y):
+    """
+    Comprueba la exactitud con equal_fast y construye la función potencial
+    Devuelve {'is_exact', 'check', 'dM_dy', 'dN_dx', 'potential'}; potential es
+    None si la ecuación no es exacta o una integral no tiene forma cerrada.
+    """
+    dM_dy = diff(M, y)
+    dN_dx = diff(N, x)
+    is_exact, check = equal_fast(dM_dy, dN_dx, (x, y))
+    return {
+        'is_exact': is_exact,
+        'check': check,
+        'dM_dy': dM_dy,
+        'dN_dx': dN_dx,
+        'potential': potential_function(M, N, x, y) if is_exact else None
+    }
+
+
+# ---------------------------------------------------------------------------
+# Factores integrantes: μ(x), μ(y), μ(xy), μ(x+y), x^a·y^b
+# ---------------------------------------------------------------------------
+
+def _evaluate(expr, point):
+    """Valor numérico de expr en point, o None si no es un número finito"""
+    value = expr.evalf(20, subs=point)
+    if not value.is_number or value.has(sp.nan, sp.zoo, sp.oo, -sp.oo):
+        return None
+    return complex(value)
+
+
+def _close(a, b):
+    return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+
+
+# Candidatos μ(z): (etiqueta, z(x, y), otro punto con el mismo z, sustitución para despejar y)
+_Z_CANDIDATES = (
+    ('μ(x)', lambda x, y: x, lambda x1, y1, r: (x1, y1 + r), None),
+    ('μ(y)', lambda x, y: y, lambda x1, y1, r: (x1 + r, y1), None),
+    ('μ(xy)', lambda x, y: x * y, lambda x1, y1, r: (x1 + r, x1 * y1 / (x1 + r)), lambda x, t: t / x),
+    ('μ(x+y)', lambda x, y: x + y, lambda x1, y1, r: (x1 + r, y1 - r), lambda x, t: t - x),
+)
+
+
+def _z_factor(label, z_of, same_z, y_of, M, N, D, x, y, rng, samples):
+    """
+    μ(z) con μ'/μ = D / (z_x·N - z_y·M) = h(z)
+    Rechaza con evaluación numérica (h distinto en puntos con el mismo z) antes
+    de cualquier trabajo simbólico. Devuelve (μ, estado).
+    """
+    z = z_of(x, y)
+    h = D / (diff(z, x) * N - diff(z, y) * M)
+    for _ in range(samples):
+        x1, y1 = sp.Rational(rng.randint(110, 1990), 1000), sp.Rational(rng.randint(110, 1990), 1000)
+        x2, y2 = same_z(x1, y1, sp.Rational(rng.randint(50, 900), 1000))
+        h1, h2 = _evaluate(h, {x: x1, y: y1}), _evaluate(h, {x: x2, y: y2})
+        if h1 is not None and h2 is not None and not _close(h1, h2):
+            return None, 'rejected_numeric'
+
+    t = sp.Dummy('t')
+    if y_of is None:
+        # z = x o z = y: h no debe depender de la otra variable
+        other = y if z == x else x
+        h_t = sp.cancel(h)
+        if h_t.has(other):
+            h_t = sp.simplify(h_t)
+        if h_t.has(other):
+            return None, 'rejected_symbolic'
+        h_t = h_t.subs(z, t)
+    else:
+        h_t = sp.cancel(h.subs(y, y_of(x, t)))
+        if h_t.has(x):
+            h_t = sp.simplify(h_t)
+        if h_t.has(x):
+            return None, 'rejected_symbolic'
+    integral_h = integral(h_t, t) if h_t != 0 else sp.S.Zero
+    if integral_h is None:
+        return None, 'no_closed_form'
+    return sp.powsimp(exp(integral_h.subs(t, z)), force=True), 'found'
+
+
+def _power_factor(M, N, D, x, y, rng, samples):
+    """
+    μ = x^a·y^b con a·N/x - b·M/y = D: a y b se obtienen de un sistema 2x2 en
+    puntos aleatorios y se comprueban en otros puntos y simbólicamente
+    """
+    # Dummy: no pueden coincidir con símbolos a, b que aparezcan en M o N
+    a, b = sp.Dummy('a'), sp.Dummy('b')
+    condition = a * N / x - b * M / y - D
+    rows = []
+    for _ in range(samples + 2):
+        point = {x: sp.Rational(rng.randint(110, 1990), 1000), y: sp.Rational(rng.randint(110, 1990), 1000)}
+        row = [_evaluate(condition.diff(a), point), _evaluate(condition.diff(b), point),
+               _evaluate(condition.subs({a: 0, b: 0}), point)]
+        if None in row:
+            continue
+        rows.append(row)
+    if len(rows) < 3:
+        return None, 'rejected_numeric'
+    (p1, q1, r1), (p2, q2, r2) = rows[0], rows[1]
+    det = p1 * q2 - p2 * q1
+    if abs(det) < 1e-12:
+        return None, 'rejected_numeric'
+    a_val = (-r1 * q2 + r2 * q1) / det
+    b_val = (-p1 * r2 + p2 * r1) / det
+    if abs(a_val.imag) > 1e-9 or abs(b_val.imag) > 1e-9:
+        return None, 'rejected_numeric'
+    if any(not _close(p * a_val + q * b_val + r, 0) for p, q, r in rows[2:]):
+        return None, 'rejected_numeric'
+    a_val = sp.nsimplify(a_val.real, rational=True, tolerance=1e-10)
+    b_val = sp.nsimplify(b_val.real, rational=True, tolerance=1e-10)
+    ok, _ = equal_fast(a_val * N / x - b_val * M / y, D, (x, y))
+    if not ok:
+        return None, 'rejected_symbolic'
+    return x**a_val * y**b_val, 'found'
+
+
+def find_integrating_factor(M, N, x, y, samples=3, seed=2024):
+    """
+    Busca μ entre los candidatos (en orden) y se detiene en el primero válido
+    Devuelve {'factor', 'type', 'candidates', 'exact'}: candidates lista por
+    candidato el estado y el tiempo empleado; exact es el resultado de
+    solve_exact sobre μM dx + μN dy = 0 (None si no se encontró μ).
+    """
+    D = diff(M, y) - diff(N, x)
+    rng = random.Random(seed)
+    report = []
+    searches = [
+        (candidate[0], lambda c=candidate: _z_factor(*c, M, N, D, x, y, rng, samples))
+        for candidate in _Z_CANDIDATES
+    ]
+    searches.append(('μ(x^a·y^b)', lambda: _power_factor(M, N, D, x, y, rng, samples)))
+
+    for label, search in searches:
+        start = time.perf_counter()
+        try:
+            mu, status = search()
+        except (NotImplementedError, ZeroDivisionError, ValueError, TypeError, sp.PolynomialError) as exc:
+            mu, status = None, f'error: {type(exc).__name__}: {exc}'
+        if mu is not None:
+            exact = solve_exact(sp.expand(mu * M), sp.expand(mu * N), x, y)
+            if not exact['is_exact']:
+                mu, status = None, 'rejected_symbolic'
+        report.append({'candidate': label, 'status': status, 'seconds': time.perf_counter() - start})
+        if mu is not None:
+            return {'factor': mu, 'type': label, 'candidates': report, 'exact': exact}
+    return {'factor': None, 'type': None, 'candidates': report, 'exact': None}
@@ -0,0 +1,285 @@
+"""
+Analizador del lenguaje de entrada de ecuaciones diferenciales
+Convierte el texto (p. ej. "y'' + 2y' = x e^x" o "dy/dx = x*y") en una
+ecuación de SymPy en una sola pasada: un tokenizador con una expresión regular
+compilada y un analizador descendente recursivo.
+
+Notación admitida:
+- Derivadas: y', y'', y''' ..., dy/dx, d2y/dx2, dny/dxn
+- y o y(x) para la función incógnita
+- Operadores + - * / ^ ** y multiplicación implícita (2x, x(x+1), 2sin(x), xy,
+  xy^2 = x*y^2, ysin(x), yy')
+- Funciones de SymPy (sin, exp, log, ln, sqrt, ...) con o sin paréntesis (sin x, exp 2x)
+- Constantes e, E, pi, PI, I
+"""
+
+import re
+
+import sympy as sp
+
+
+class ParseError(ValueError):
+    """El texto no es una ecuación válida"""
+
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<leibniz>d(?P<lorder>\d*)(?P<lfunc>[A-Za-z])/d(?P<lvar>[A-Za-z])(?P<lorder2>\d*))
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z_0-9]*)(?P<primes>'*)
+  | (?P<op>\*\*|[-+*/^(),=])
+""", re.VERBOSE)
+
+# Nombres que no se separan letra a letra en la multiplicación implícita
+_GREEK = {
+    'alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta', 'iota', 'kappa',
+    'lamda', 'lambda', 'mu', 'nu', 'xi', 'omicron', 'rho', 'sigma', 'tau', 'upsilon', 'phi',
+    'chi', 'psi', 'omega'
+}
+
+_FUNCTION_ALIASES = {
+    'ln': sp.log,
+    'abs': sp.Abs,
+    'arcsin': sp.asin,
+    'arccos': sp.acos,
+    'arctan': sp.atan,
+}
+
+_CONSTANTS = {
+    'e': sp.E,
+    'E': sp.E,
+    'pi': sp.pi,
+    'PI': sp.pi,
+    'I': sp.I,
+}
+
+
+def tokenize(text):
+    """Lista de tokens (tipo, valor, posición); lanza ParseError ante caracteres no válidos"""
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise ParseError(f"Carácter no válido '{text[pos]}' en la posición {pos + 1}")
+        if match.group('leibniz'):
+            order, order2 = match.group('lorder'), match.group('lorder2')
+            if order != order2:
+                raise ParseError(f"Derivada mal escrita: {match.group(0)}")
+            tokens.append(('deriv', (match.group('lfunc'), match.group('lvar'), int(order or 1)), pos))
+        elif match.group('name'):
+            primes = len(match.group('primes'))
+            if primes:
+                tokens.append(('deriv', (match.group('name'), None, primes), pos))
+            else:
+                tokens.append(('name', match.group('name'), pos))
+        elif match.group('number'):
+            tokens.append(('number', match.group('number'), pos))
+        elif match.group('op'):
+            op = match.group('op')
+            tokens.append(('op', '**' if op == '^' else op, pos))
+        pos = match.end()
+    tokens.append(('end', None, len(text)))
+    return tokens
+
+
+class _Parser:
+    """Analizador descendente recursivo sobre la lista de tokens"""
+
+    def __init__(self, tokens, names, x, func):
+        self.tokens = tokens
+        self.index = 0
+        self.names = names
+        self.x = x
+        self.func = func
+
+    # -- utilidades -------------------------------------------------------
+
+    @property
+    def current(self):
+        return self.tokens[self.index]
+
+    def advance(self):
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def accept(self, op):
+        kind, value, _ = self.current
+        if kind == 'op' and value == op:
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, op):
+        if not self.accept(op):
+            kind, value, pos = self.current
+            found = 'el final' if kind == 'end' else f"'{value}'"
+            raise ParseError(f"Se esperaba '{op}' en la posición {pos + 1} y se encontró {found}")
+
+    def starts_factor(self):
+        kind, value, _ = self.current
+        return kind in ('number', 'name', 'deriv') or (kind == 'op' and value == '(')
+
+    # -- gramática --------------------------------------------------------
+
+    def equation(self):
+        lhs = self.expression()
+        if self.accept('='):
+            rhs = self.expression()
+            result = sp.Eq(lhs, rhs)
+        else:
+            result = lhs
+        kind, value, pos = self.current
+        if kind != 'end':
+            raise ParseError(f"Símbolo inesperado '{value}' en la posición {pos + 1}")
+        return result
+
+    def expression(self):
+        terms = [self.term()]
+        while True:
+            if self.accept('+'):
+                terms.append(self.term())
+            elif self.accept('-'):
+                terms.append(-self.term())
+            else:
+                return sp.Add(*terms)
+
+    def term(self):
+        factors = [self.unary()]
+        while True:
+            if self.accept('*'):
+                factors.append(self.unary())
+            elif self.accept('/'):
+                factors.append(1 / self.unary())
+            elif self.starts_factor():
+                # Multiplicación implícita: 2x, x(x+1), 2sin(x)
+                factors.append(self.power())
+            else:
+                return sp.Mul(*factors)
+
+    def unary(self):
+        if self.accept('-'):
+            return -self.unary()
+        if self.accept('+'):
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        base = self.primary()
+        if self.accept('**'):
+            return base ** self.unary()
+        return base
+
+    def primary(self):
+        kind, value, pos = self.advance()
+        if kind == 'number':
+            return sp.Integer(value) if value.isdigit() else sp.Float(value)
+        if kind == 'deriv':
+            name, var, order = value
+            if var is None and self.func is not None and len(name) > 1 and name.endswith(self.func.__name__):
+                # Producto pegado que termina en la derivada: xy' -> x*y', yy'' -> y*y''
+                split = len(name) - len(self.func.__name__)
+                self.index -= 1
+                self.tokens[self.index:self.index + 1] = [
+                    ('name', name[:split], pos), ('deriv', (name[split:], None, order), pos + split)
+                ]
+                return self.primary()
+            return self.derivative(value, pos)
+        if kind == 'name':
+            return self.name(value, pos)
+        if kind == 'op' and value == '(':
+            inner = self.expression()
+            self.expect(')')
+            return inner
+        found = 'el final de la ecuación' if kind == 'end' else f"'{value}'"
+        raise ParseError(f"Expresión incompleta: se encontró {found} en la posición {pos + 1}")
+
+    def arguments(self):
+        args = []
+        if not self.accept(')'):
+            args.append(self.expression())
+            while self.accept(','):
+                args.append(self.expression())
+            self.expect(')')
+        return args
+
+    def derivative(self, value, pos):
+        name, var, order = value
+        if self.func is None or name != self.func.__name__:
+            raise ParseError(f"Derivada de '{name}' no admitida en la posición {pos + 1}")
+        if var is not None and var != self.x.name:
+            raise ParseError(f"Variable independiente desconocida '{var}' en la posición {pos + 1}")
+        return sp.Derivative(self.func(self.x), (self.x, order))
+
+    def name(self, name, pos):
+        kind, value, _ = self.current
+        call = kind == 'op' and value == '('
+        if name in self.names:
+            target = self.names[name]
+            if isinstance(target, sp.FunctionClass) and target is self.func:
+                if call:
+                    self.advance()
+                    return target(*self.arguments())
+                return target(self.x)
+            if callable(target) and not isinstance(target, sp.Basic):
+                return self.call(target, call, name, pos)
+            return target
+        if name in _CONSTANTS:
+            return _CONSTANTS[name]
+        function = _FUNCTION_ALIASES.get(name) or self.sympy_function(name)
+        if function is not None:
+            return self.call(function, call, name, pos)
+        if len(name) > 1 and name.isalpha() and name not in _GREEK:
+            # Símbolos pegados (xy -> x*y), igual que split_symbols de SymPy: se
+            # separa la primera letra y el resto vuelve a la lista de tokens, de modo
+            # que el exponente solo afecta al último factor (xy^2 -> x*y^2) y las
+            # funciones del final se reconocen (ysin(x) -> y*sin(x))
+            self.tokens.insert(self.index, ('name', name[1:], pos + 1))
+            return self.name_atom(name[0])
+        return sp.Symbol(name)
+
+    def name_atom(self, letter):
+        if letter in self.names:
+            target = self.names[letter]
+            if isinstance(target, sp.FunctionClass) and target is self.func:
+                return target(self.x)
+            return target
+        return _CONSTANTS.get(letter, sp.Symbol(letter))
+
+    def call(self, function, call, name, pos):
+        if call:
+            self.advance()
+            return function(*self.arguments())
+        if self.starts_factor():
+            # Aplicación sin paréntesis: sin x, exp 2x (un coeficiente numérico
+            # arrastra al factor que le sigue: exp 2x -> exp(2*x))
+            argument = self.power()
+            if argument.is_Number and self.starts_factor():
+                argument *= self.power()
+            return function(argument)
+        raise ParseError(f"Falta el argumento de '{name}' en la posición {pos + 1}")
+
+    @staticmethod
+    def sympy_function(name):
+        if name.startswith('_'):
+            return None
+        candidate = getattr(sp, name, None)
+        if isinstance(candidate, sp.FunctionClass) or name in ('Derivative', 'sqrt', 'root', 'diff'):
+            return candidate
+        return None
+
+
+def parse(text, x, func=None, names=None):
+    """
+    Analiza el texto y devuelve un Eq (o una expresión si no hay '=')
+    func es la función incógnita (y); si es None, y se trata como símbolo.
+    """
+    if not text or not text.strip():
+        raise ParseError("La ecuación está vacía")
+    names = dict(names or {})
+    names.setdefault(x.name, x)
+    if func is not None:
+        names.setdefault(func.__name__, func)
+    parser = _Parser(tokenize(text), names, x, func)
+    return parser.equation()
@@ -1,25 +1,28 @@
 """
 Interfaz gráfica para el solucionador de ecuaciones diferenciales
 Usando CustomTkinter para un diseño moderno
+La ventana se muestra antes de cargar SymPy y matplotlib: el solucionador y el
+renderizador LaTeX se construyen en el hilo de trabajo después del primer pintado.
 """
 
-import io
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import customtkinter as ctk
 from tkinter import messagebox
-from PIL import Image, ImageTk
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
-from ode_solver import ODESolver
 
 
 # Configuración de apariencia
 ctk.set_appearance_mode("dark")  # Modes: "System", "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue", "green", "dark-blue"
 
+# Tiempo máximo (segundos) de cada resolución antes de abortarla
+SOLVE_TIMEOUT = 120
+# Intervalo (ms) de consulta de resultados del hilo de resolución
+POLL_INTERVAL_MS = 50
+
 
 class ODESolverGUI:
     def __init__(self, root):
@@ -27,10 +30,56 @@ class ODESolverGUI:
         self.root.title("Solucionador de Ecuaciones Diferenciales")
         self.root.geometry("1100x800")
         
-        self.solver = ODESolver()
+        # Se crean en _load_backend, después de mostrar la ventana
+        self.solver = None
+        self.latex_renderer = None
+        self.plot_panel = None
+        self._backend_ready = threading.Event()
+        self._backend_error = None
+        self._waiting_backend = False
+        self._plots_available = False
         self.latex_image = None
         
+        # Las resoluciones y el renderizado LaTeX se ejecutan fuera del hilo de Tk;
+        # los resultados vuelven por una cola que se consulta con root.after
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._results = queue.Queue()
+        self._request_id = 0
+        self._future = None
+        
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(POLL_INTERVAL_MS, self._poll_results)
+        self.root.after_idle(self._start_backend)
+    
+    def _start_backend(self):
+        """Tras el primer pintado, carga el motor simbólico en el hilo de trabajo"""
+        self.root.update_idletasks()
+        # El executor tiene un solo hilo: las resoluciones pedidas antes de que
+        # termine la carga esperan detrás de ella
+        self.executor.submit(self._load_backend)
+    
+    def _load_backend(self):
+        # Cualquier fallo (también al importar) queda en _backend_error: el executor
+        # se tragaría la excepción y las peticiones esperarían para siempre
+        try:
+            from latex_render import LatexRenderer
+            from ode_solver import ODESolver
+            
+            self.solver = ODESolver(timeout=SOLVE_TIMEOUT, race=True)
+            self.latex_renderer = LatexRenderer()
+            self.latex_renderer.warm_up()
+        except Exception as e:
+            self._backend_error = f"No se pudo cargar el motor simbólico: {e}"
+        finally:
+            self._backend_ready.set()
+        try:
+            # Solo se importa (matplotlib con el backend de Tk); el panel se crea al primer gráfico.
+            # Sin él se resuelve igual, pero sin gráficas
+            import plot_panel  # noqa: F401
+            self._plots_available = True
+        except Exception:
+            self._plots_available = False
     
     def setup_ui(self):
         # Título
@@ -291,6 +340,19 @@ Reducible: y'' = x  |  y'' = y'**2"""
         )
         solve_button.pack(side='left', padx=10)
         
+        self.cancel_button = ctk.CTkButton(
+            button_container,
+            text="⏹️ Cancelar",
+            command=self.cancel_solve,
+            font=ctk.CTkFont(size=15, weight="bold"),
+            height=45,
+            width=150,
+            fg_color="#7f8c8d",
+            hover_color="#636e72",
+            state="disabled"
+        )
+        self.cancel_button.pack(side='left', padx=10)
+        
         clear_button = ctk.CTkButton(
             button_container,
             text="🗑️ Limpiar",
@@ -303,6 +365,15 @@ Reducible: y'' = x  |  y'' = y'**2"""
         )
         clear_button.pack(side='left', padx=10)
         
+        # Indicador de progreso (visible solo mientras se resuelve)
+        self.progress_bar = ctk.CTkProgressBar(main_frame, mode='indeterminate', width=400)
+        self.status_label = ctk.CTkLabel(
+            main_frame,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color=("gray40", "gray70")
+        )
+        
         # Título y contenedor para solución en LaTeX
         self.solution_title = ctk.CTkLabel(
             main_frame,
@@ -314,6 +385,9 @@ Reducible: y'' = x  |  y'' = y'**2"""
         self.latex_image_label = ctk.CTkLabel(main_frame, text="")
         self.latex_image_label.pack(pady=(5, 15))
         self.latex_image_label.pack_forget()
+        
+        # Campo de pendientes y curvas solución (el PlotPanel se crea al primer gráfico)
+        self.plot_frame = ctk.CTkFrame(main_frame)
 
     def insert_special_character(self, text):
         """Inserta caracteres especiales en el campo enfocado"""
@@ -357,68 +431,219 @@ Reducible: y'' = x  |  y'' = y'**2"""
     
     def solve_equation(self):
         """Resuelve la ecuación según el método seleccionado"""
+        if not self._backend_ready.is_set():
+            # Todavía se está cargando SymPy: se reintenta sin bloquear el hilo de Tk
+            if not self._waiting_backend:
+                self._waiting_backend = True
+                self.status_label.configure(text="⏳ Cargando el motor simbólico...")
+                self.status_label.pack(pady=(5, 0), before=self.solution_title)
+                self.root.after(POLL_INTERVAL_MS, self._retry_solve)
+            return
+        if self._backend_error:
+            messagebox.showerror("Error", self._backend_error)
+            return
+        from ode_solver import MN_METHODS
+        
         method = self.method_var.get()
         
-        try:
-            if method in ['exact', 'integrating_factor']:
-                M_str = self.m_entry.get().strip()
-                N_str = self.n_entry.get().strip()
-                
-                if not M_str or not N_str:
-                    messagebox.showerror("Error", "Por favor ingrese M(x,y) y N(x,y)")
-                    return
-                
-                if method == 'exact':
-                    result = self.solver.solve_exact(M_str, N_str)
-                else:
-                    result = self.solver.find_integrating_factor(M_str, N_str)
-            else:
-                equation = self.equation_entry.get().strip()
-                
-                if not equation:
-                    messagebox.showerror("Error", "Por favor ingrese una ecuación")
-                    return
-                
-                try:
-                    initial_conditions = self._get_initial_conditions()
-                except ValueError as ic_error:
-                    messagebox.showerror("Error", str(ic_error))
-                    return
-                
-                if method == 'general':
-                    result = self.solver.solve_general(equation, initial_conditions=initial_conditions)
-                elif method == 'separable':
-                    result = self.solver.solve_separable(equation, initial_conditions=initial_conditions)
-                elif method == 'homogeneous':
-                    result = self.solver.solve_homogeneous(equation, initial_conditions=initial_conditions)
-                elif method == 'linear':
-                    result = self.solver.solve_linear(equation, initial_conditions=initial_conditions)
-                elif method == 'bernoulli':
-                    result = self.solver.solve_bernoulli(equation, initial_conditions=initial_conditions)
-                elif method == 'second_order_const':
-                    result = self.solver.solve_second_order_constant_coeff(equation, initial_conditions=initial_conditions)
-                elif method == 'reducible':
-                    result = self.solver.solve_reducible_to_first_order(equation, initial_conditions=initial_conditions)
+        if method in MN_METHODS:
+            M_str = self.m_entry.get().strip()
+            N_str = self.n_entry.get().strip()
+            
+            if not M_str or not N_str:
+                messagebox.showerror("Error", "Por favor ingrese M(x,y) y N(x,y)")
+                return
+            
+            spec = {'method': method, 'M': M_str, 'N': N_str}
+        else:
+            equation = self.equation_entry.get().strip()
             
-            self._show_latex_solution(result)
+            if not equation:
+                messagebox.showerror("Error", "Por favor ingrese una ecuación")
+                return
             
+            try:
+                initial_conditions = self._get_initial_conditions()
+            except ValueError as ic_error:
+                messagebox.showerror("Error", str(ic_error))
+                return
+            
+            spec = {'method': method, 'equation': equation, 'initial_conditions': initial_conditions}
+        
+        self._submit(spec)
+    
+    def _retry_solve(self):
+        if not self._backend_ready.is_set():
+            self.root.after(POLL_INTERVAL_MS, self._retry_solve)
+            return
+        self._waiting_backend = False
+        self.status_label.pack_forget()
+        self.solve_equation()
+    
+    def _submit(self, spec):
+        """Lanza la resolución en segundo plano; una nueva petición reemplaza a la anterior"""
+        if self._future is not None and not self._future.done() and self.solver is not None:
+            self.solver.cancel()
+        self._request_id += 1
+        self._set_busy(True)
+        theme = ctk.get_appearance_mode().lower()
+        self._future = self.executor.submit(self._solve_job, self._request_id, spec, theme)
+    
+    def _solve_job(self, request_id, spec, theme):
+        """
+        Se ejecuta en el hilo de trabajo: resuelve y renderiza la imagen LaTeX
+        La solución se publica antes de preparar la gráfica, que con condiciones
+        iniciales necesita además la solución general; una petición nueva
+        cancela esa resolución igual que la principal.
+        """
+        image = None
+        try:
+            result = self.solver.solve_spec(spec)
+            if result.get('success') and request_id == self._request_id:
+                image = self._render_latex_image(self._latex_text(result), theme)
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            result = {'success': False, 'error': str(e)}
+        self._results.put(('solution', request_id, result, image))
+        if not result.get('success') or request_id != self._request_id:
+            return
+        try:
+            plot = self._plot_data(request_id, spec, result)
+        except Exception:
+            plot = None
+        self._results.put(('plot', request_id, plot))
+    
+    def _plot_data(self, request_id, spec, result):
+        """
+        Prepara en el hilo de trabajo las funciones del panel de gráficas: la pendiente
+        y las soluciones se compilan aquí y el hilo de Tk solo las evalúa con NumPy
+        """
+        import numpy as np
+        import sympy as sp
+        from ode_solver import MN_METHODS
+        
+        if not self._plots_available or spec['method'] in MN_METHODS:
+            return None
+        from plot_panel import FAMILY_VALUES
+
+        ics = spec.get('initial_conditions')
+        try:
+            slope = self.solver.compile_slope(spec['equation'])
+        except Exception:
+            slope = None
+        
+        general, particular = result, None
+        if ics:
+            # La familia de curvas sale de la solución general (sin condiciones iniciales);
+            # si ya se resolvió antes sin ellas, sale de la caché del solucionador
+            particular = result
+            if request_id != self._request_id:
+                return None
+            general = self.solver.solve_spec(dict(spec, initial_conditions=None))
+        
+        family = particular_curve = point = None
+        try:
+            if general.get('success') and not general.get('numeric'):
+                _, names = self.solver.compile_solution(general)
+                if names:
+                    constants = {name: 1.0 for name in names}
+                    constants[names[0]] = np.array(FAMILY_VALUES)[:, None]
+                    family = functools.partial(self.solver.evaluate, general, constants=constants)
+        except Exception:
+            family = None
+        try:
+            if particular is not None:
+                if not particular.get('numeric'):
+                    self.solver.compile_solution(particular)
+                particular_curve = functools.partial(self.solver.evaluate, particular)
+            if ics and ics.get('y0') is not None:
+                point = (float(sp.sympify(ics['x0'])), float(sp.sympify(ics['y0'])))
+        except Exception:
+            particular_curve = point = None
+        
+        if slope is None and family is None and particular_curve is None:
+            return None
+        return {
+            'slope': slope,
+            'family': family,
+            'particular': particular_curve,
+            'point': point,
+            'title': spec['equation']
+        }
     
-    def _show_latex_solution(self, result):
+    def _poll_results(self):
+        """Recoge en el hilo de Tk los resultados terminados, descartando los obsoletos"""
+        try:
+            while True:
+                kind, request_id, *payload = self._results.get_nowait()
+                if request_id != self._request_id:
+                    continue
+                if kind == 'plot':
+                    self._show_plot(*payload)
+                    continue
+                result, image = payload
+                self._set_busy(False)
+                self._show_latex_solution(result, image)
+                if not result.get('success'):
+                    self._show_plot(None)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_INTERVAL_MS, self._poll_results)
+    
+    def cancel_solve(self):
+        """Cancela la resolución en curso"""
+        self._request_id += 1
+        if self.solver is not None:
+            self.solver.cancel()
+        self._set_busy(False)
+    
+    def _set_busy(self, busy):
+        if busy:
+            self.status_label.configure(text="⏳ Resolviendo...")
+            self.status_label.pack(pady=(5, 0), before=self.solution_title)
+            self.progress_bar.pack(pady=(5, 10), before=self.solution_title)
+            self.progress_bar.start()
+            self.cancel_button.configure(state="normal")
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
+            self.status_label.pack_forget()
+            self.cancel_button.configure(state="disabled")
+    
+    def _latex_text(self, result):
+        return result.get('solution_latex') or result.get('solution') or 'No se encontró una solución.'
+    
+    def _show_latex_solution(self, result, image=None):
         if not result.get('success'):
-            messagebox.showerror("Error", result.get('error', 'No se pudo resolver la ecuación'))
+            error = result.get('error', 'No se pudo resolver la ecuación')
+            if error == 'cancelled':
+                return
+            if error == 'timeout':
+                error = f"Se agotó el tiempo máximo de resolución ({result.get('timeout')} s)"
+            messagebox.showerror("Error", error)
             self.solution_title.configure(text="")
             self._clear_latex_image()
             return
-        latex_text = result.get('solution_latex') or result.get('solution')
-        if not latex_text:
-            latex_text = 'No se encontró una solución.'
         self.solution_title.configure(text="📐 Solución en LaTeX")
-        self._display_latex_image(latex_text)
+        if image is None:
+            image = self._render_latex_image(self._latex_text(result))
+        self._display_latex_image(image)
+
+    def _show_plot(self, plot):
+        """Muestra el campo de pendientes y las curvas (o oculta el panel si no hay gráfica)"""
+        if plot is None:
+            self.plot_frame.pack_forget()
+            return
+        if self.plot_panel is None:
+            from plot_panel import PlotPanel
+            
+            self.plot_panel = PlotPanel(self.plot_frame, theme=ctk.get_appearance_mode().lower())
+        self.plot_frame.pack(fill='both', expand=True, pady=(0, 15), padx=10)
+        self.plot_panel.show(**plot)
 
-    def _display_latex_image(self, latex_str):
-        image = self._render_latex_image(latex_str)
+    def _display_latex_image(self, pil_image):
+        from PIL import ImageTk
+        
+        image = ImageTk.PhotoImage(pil_image) if pil_image is not None else None
         if image:
             self.latex_image_label.configure(image=image, text="")
             self.latex_image_label.image = image  # Evitar recolección de basura
@@ -433,31 +658,10 @@ Reducible: y'' = x  |  y'' = y'**2"""
         self.latex_image = None
         self.latex_image_label.pack_forget()
 
-    def _render_latex_image(self, latex_str):
-        try:
-            buffer = io.BytesIO()
-            text_len = max(len(latex_str), 1)
-            width = min(max(text_len * 0.12, 3), 8)
-            fig = plt.figure(figsize=(width, 1.3), dpi=200)
-            fig.patch.set_facecolor('none')
-            ax = fig.add_subplot(111)
-            ax.axis('off')
-            ax.text(
-                0.5,
-                0.5,
-                f"${latex_str}$",
-                fontsize=18,
-                ha='center',
-                va='center',
-                color='white'
-            )
-            fig.savefig(buffer, format='png', bbox_inches='tight', pad_inches=0.15, transparent=True)
-            plt.close(fig)
-            buffer.seek(0)
-            image = Image.open(buffer).convert('RGBA')
-            return ImageTk.PhotoImage(image)
-        except Exception:
-            return None
+    def _render_latex_image(self, latex_str, theme=None):
+        """Renderiza LaTeX a una imagen PIL (con caché; seguro fuera del hilo de Tk)"""
+        theme = theme or ctk.get_appearance_mode().lower()
+        return self.latex_renderer.render(latex_str, theme)
 
     def clear_all(self):
         """Limpia todos los campos"""
@@ -469,6 +673,15 @@ Reducible: y'' = x  |  y'' = y'**2"""
         self.yp0_entry.delete(0, "end")
         self.solution_title.configure(text="")
         self._clear_latex_image()
+        self.plot_frame.pack_forget()
+
+    def on_close(self):
+        """Cancela el trabajo pendiente y cierra la ventana"""
+        self.cancel_solve()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.solver is not None:
+            self.solver.close()
+        self.root.destroy()
 
     def _get_initial_conditions(self):
         x0 = self.x0_entry.get().strip()
@@ -0,0 +1,109 @@
+"""
+Instrumentación del solucionador: duraciones por fase y perfilado opcional
+Cada resolución abre una traza (por hilo); el código del solucionador marca sus
+fases con span('fase') y la traza acumula las duraciones.
+"""
+
+import io
+import threading
+import time
+from contextlib import contextmanager
+
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+_local = threading.local()
+
+
+class Trace:
+    """Duraciones acumuladas por fase y datos adicionales de una resolución"""
+
+    def __init__(self):
+        self.timings = {}
+        self.info = {}
+
+    @contextmanager
+    def span(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def reset():
+    """Descarta la traza activa del hilo (p. ej. la heredada por un proceso hijo tras fork)"""
+    _local.trace = None
+
+
+def current_trace():
+    return getattr(_local, 'trace', None)
+
+
+@contextmanager
+def span(phase):
+    """Mide la fase dentro de la traza activa (no hace nada si no hay traza)"""
+    trace = current_trace()
+    if trace is None:
+        yield
+        return
+    with trace.span(phase):
+        yield
+
+
+def record(key, value):
+    """Guarda un dato (por ejemplo el hint elegido) en la traza activa"""
+    trace = current_trace()
+    if trace is not None:
+        trace.info[key] = value
+
+
+@contextmanager
+def tracing():
+    """
+    Abre una traza si no hay una activa en este hilo
+    Devuelve (trace, owner); owner es False cuando la llamada está anidada dentro
+    de otra resolución y la traza pertenece a la llamada externa.
+    """
+    trace = current_trace()
+    if trace is not None:
+        yield trace, False
+        return
+    trace = Trace()
+    _local.trace = trace
+    try:
+        yield trace, True
+    finally:
+        _local.trace = None
+
+
+class Profiler:
+    """Captura opcional de un perfil (cProfile o pyinstrument) por resolución"""
+
+    def __init__(self, kind):
+        if kind not in PROFILERS:
+            raise ValueError(f"Perfilador desconocido: {kind}. Opciones: {', '.join(PROFILERS)}")
+        self.kind = kind
+        if kind == 'cprofile':
+            import cProfile
+            self._profiler = cProfile.Profile()
+        else:
+            from pyinstrument import Profiler as PyinstrumentProfiler
+            self._profiler = PyinstrumentProfiler()
+
+    def start(self):
+        if self.kind == 'cprofile':
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+
+    def stop(self, limit=30):
+        """Detiene el perfil y devuelve el informe en texto"""
+        if self.kind == 'cprofile':
+            import pstats
+            self._profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+            return out.getvalue()
+        self._profiler.stop()
+        return self._profiler.output_text()
@@ -0,0 +1,136 @@
+"""
+Renderizado de expresiones LaTeX a imágenes para la interfaz gráfica
+Reutiliza una única figura de matplotlib y guarda en una caché LRU las
+imágenes ya renderizadas (clave: texto LaTeX y tema). matplotlib, NumPy y PIL
+se importan al crear la figura en el primer renderizado, no al importar el módulo.
+"""
+
+import threading
+import time
+
+from solve_cache import LRUCache
+
+
+# Color del texto según el modo de apariencia de la GUI
+THEME_COLORS = {
+    'dark': 'white',
+    'light': 'black'
+}
+
+
+class LatexRenderer:
+    """Renderiza LaTeX (mathtext) a imágenes PIL RGBA con fondo transparente"""
+
+    def __init__(self, cache_size=32, dpi=200, fontsize=18, pad_inches=0.15):
+        self.dpi = dpi
+        self.pad_inches = pad_inches
+        self.fontsize = fontsize
+        self._figure = None
+        self._cache = LRUCache(cache_size)
+        self._lock = threading.Lock()
+
+    def _ensure_figure(self):
+        if self._figure is not None:
+            return
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        figure = Figure(dpi=self.dpi)
+        self._canvas = FigureCanvasAgg(figure)
+        figure.patch.set_alpha(0)
+        self._text = figure.text(0.5, 0.5, '', fontsize=self.fontsize, ha='center', va='center')
+        self._figure = figure
+
+    def warm_up(self):
+        """Crea la figura y carga las fuentes de mathtext (p. ej. en un hilo en segundo plano)"""
+        with self._lock:
+            self._draw('x', 'dark')
+
+    def render(self, latex_str, theme='dark'):
+        """Devuelve la imagen PIL de la expresión, o None si no se puede renderizar"""
+        key = (latex_str, theme)
+        image = self._cache.get(key)
+        if image is None:
+            with self._lock:
+                image = self._draw(latex_str, theme)
+            if image is not None:
+                self._cache.put(key, image)
+        return image
+
+    def _draw(self, latex_str, theme):
+        try:
+            import numpy as np
+            from PIL import Image
+
+            self._ensure_figure()
+            self._text.set_text(f"${latex_str}$")
+            self._text.set_color(THEME_COLORS.get(theme, 'white'))
+            # Ajustar la figura al tamaño del texto (equivalente a bbox_inches='tight')
+            extent = self._text.get_window_extent(renderer=self._canvas.get_renderer())
+            pad = self.pad_inches * self.dpi
+            self._figure.set_size_inches(
+                (extent.width + 2 * pad) / self.dpi,
+                (extent.height + 2 * pad) / self.dpi
+            )
+            self._canvas.draw()
+            rgba = np.asarray(self._canvas.buffer_rgba())
+            return Image.fromarray(rgba.copy(), 'RGBA')
+        except Exception:
+            return None
+
+    def cache_info(self):
+        return self._cache.info()
+
+    def clear_cache(self):
+        self._cache.clear()
+
+
+def _render_with_new_figure(latex_str, theme='dark'):
+    # Renderizado original (figura nueva + PNG + PIL), usado como referencia
+    import io
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    width = min(max(max(len(latex_str), 1) * 0.12, 3), 8)
+    fig = Figure(figsize=(width, 1.3), dpi=200)
+    FigureCanvasAgg(fig)
+    fig.patch.set_facecolor('none')
+    ax = fig.add_subplot(111)
+    ax.axis('off')
+    ax.text(0.5, 0.5, f"${latex_str}$", fontsize=18, ha='center', va='center',
+            color=THEME_COLORS.get(theme, 'white'))
+    fig.savefig(buffer, format='png', bbox_inches='tight', pad_inches=0.15, transparent=True)
+    buffer.seek(0)
+    return Image.open(buffer).convert('RGBA')
+
+
+def benchmark(repeats=20):
+    """Compara el renderizado original con la figura reutilizada y la caché"""
+    expressions = [
+        r"y{\left(x \right)} = C_{1} e^{\frac{x^{2}}{2}}",
+        r"y{\left(x \right)} = C_{1} \sin{\left(x \right)} + C_{2} \cos{\left(x \right)} + x",
+        r"y{\left(x \right)} = x \left(C_{1} + \log{\left(x \right)}\right)",
+        r"y{\left(x \right)} = \frac{1}{C_{1} e^{x} + x + 1}",
+    ]
+
+    def measure(func):
+        start = time.perf_counter()
+        for i in range(repeats):
+            func(expressions[i % len(expressions)] + "\\," * (i // len(expressions)))
+        return (time.perf_counter() - start) / repeats * 1000
+
+    renderer = LatexRenderer(cache_size=repeats)
+    baseline = measure(_render_with_new_figure)
+    reused = measure(renderer.render)
+    cached = measure(renderer.render)
+    print(f"Figura nueva + PNG:           {baseline:8.2f} ms/expresión")
+    print(f"Figura reutilizada (nuevas):  {reused:8.2f} ms/expresión")
+    print(f"Caché (repetidas):            {cached:8.3f} ms/expresión")
+    return {'new_figure_ms': baseline, 'reused_figure_ms': reused, 'cached_ms': cached}
+
+
+if __name__ == "__main__":
+    benchmark()
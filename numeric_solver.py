@@ -0,0 +1,164 @@
+"""
+Integración numérica de problemas de valor inicial con NumPy
+Métodos adaptativos: RK45 (Dormand-Prince) y Radau IIA de orden 5 (implícito,
+para ecuaciones rígidas)
+"""
+
+import numpy as np
+
+
+# Tablero de Butcher de Dormand-Prince 5(4)
+_DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+_DP_A = [
+    np.array([]),
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]),
+    np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+]
+_DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+_DP_E = _DP_B - np.array([5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40])
+
+# Coeficientes de Radau IIA de 3 etapas (orden 5)
+_SQ6 = np.sqrt(6)
+_RADAU_C = np.array([(4 - _SQ6) / 10, (4 + _SQ6) / 10, 1])
+_RADAU_A = np.array([
+    [(88 - 7 * _SQ6) / 360, (296 - 169 * _SQ6) / 1800, (-2 + 3 * _SQ6) / 225],
+    [(296 + 169 * _SQ6) / 1800, (88 + 7 * _SQ6) / 360, (-2 - 3 * _SQ6) / 225],
+    [(16 - _SQ6) / 36, (16 + _SQ6) / 36, 1 / 9],
+])
+
+METHODS = ('RK45', 'Radau')
+
+
+class IntegrationError(Exception):
+    """La integración numérica no pudo completarse"""
+
+
+def _error_norm(error, y_old, y_new, rtol, atol):
+    scale = atol + rtol * np.maximum(np.abs(y_old), np.abs(y_new))
+    return np.sqrt(np.mean((error / scale) ** 2))
+
+
+def _rk45_step(f, t, y, h, f0):
+    k = np.empty((7, y.size))
+    k[0] = f0
+    for i in range(1, 7):
+        k[i] = f(t + _DP_C[i] * h, y + h * (_DP_A[i] @ k[:i]))
+    y_new = y + h * (_DP_B @ k)
+    return y_new, h * (_DP_E @ k), k[6]
+
+
+def _numeric_jacobian(f, t, y, f0):
+    n = y.size
+    jac = np.empty((n, n))
+    for j in range(n):
+        delta = 1e-8 * max(1.0, abs(y[j]))
+        y_shift = y.copy()
+        y_shift[j] += delta
+        jac[:, j] = (f(t, y_shift) - f0) / delta
+    return jac
+
+
+def _radau_single(f, t, y, h, jac, newton_tol, max_newton=10):
+    """Un paso de Radau IIA resolviendo el sistema de etapas con Newton simplificado"""
+    n = y.size
+    z = np.zeros((3, n))
+    matrix = np.eye(3 * n) - h * np.kron(_RADAU_A, jac)
+    for _ in range(max_newton):
+        stages = np.array([f(t + _RADAU_C[i] * h, y + z[i]) for i in range(3)])
+        residual = z - h * (_RADAU_A @ stages)
+        dz = np.linalg.solve(matrix, -residual.ravel()).reshape(3, n)
+        z += dz
+        if np.linalg.norm(dz) <= newton_tol * (1 + np.linalg.norm(z)):
+            return y + z[2]
+    return None
+
+
+def _radau_step(f, t, y, h, f0):
+    # Estimación del error por duplicación de paso: un paso h frente a dos pasos h/2
+    jac = _numeric_jacobian(f, t, y, f0)
+    full = _radau_single(f, t, y, h, jac, 1e-10)
+    mid = _radau_single(f, t, y, h / 2, jac, 1e-10)
+    half = _radau_single(f, t + h / 2, mid, h / 2, jac, 1e-10) if mid is not None else None
+    if full is None or half is None:
+        return None, None, None
+    error = (half - full) / (2 ** 5 - 1)
+    return half, error, f(t + h, half)
+
+
+def integrate_ivp(f, t0, y0, t_eval, method='RK45', rtol=1e-6, atol=1e-9, max_steps=100000):
+    """
+    Integra y' = f(t, y) desde (t0, y0) devolviendo la solución en los puntos t_eval
+    (ordenados y todos en la misma dirección respecto de t0)
+    Devuelve un dict con 't', 'y' (una fila por punto), 'error_estimate' (cota
+    acumulada del error local en cada punto), 'steps', 'rejected' y 'nfev'.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método numérico desconocido: {method}. Opciones: {', '.join(METHODS)}")
+    # Los desbordamientos se detectan como pasos no finitos y se rechazan
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        return _integrate(f, t0, y0, t_eval, method, rtol, atol, max_steps)
+
+
+def _integrate(f, t0, y0, t_eval, method, rtol, atol, max_steps):
+    step = _rk45_step if method == 'RK45' else _radau_step
+    order = 5
+
+    calls = [0]
+
+    def fun(t, y):
+        calls[0] += 1
+        return np.asarray(f(t, y), dtype=float)
+
+    t_eval = np.asarray(t_eval, dtype=float)
+    y = np.atleast_1d(np.asarray(y0, dtype=float))
+    t = float(t0)
+    direction = 1.0 if t_eval.size == 0 or t_eval[-1] >= t else -1.0
+    span = abs(t_eval[-1] - t) if t_eval.size else 0.0
+
+    ys = np.empty((t_eval.size, y.size))
+    errors = np.empty(t_eval.size)
+    accumulated = 0.0
+    f0 = fun(t, y)
+    h = 1e-2 * span or 1e-3
+    steps = rejected = 0
+
+    for index, target in enumerate(t_eval):
+        while direction * (target - t) > 1e-14 * max(1.0, abs(target)):
+            if steps + rejected >= max_steps:
+                raise IntegrationError(f"Se alcanzó el máximo de {max_steps} pasos en x = {t:g}")
+            h_step = min(h, abs(target - t))
+            y_new, error, f_new = step(fun, t, y, direction * h_step, f0)
+            if y_new is None or not np.all(np.isfinite(y_new)):
+                rejected += 1
+                h = h_step / 4
+                if h < 1e-14 * max(1.0, abs(t)):
+                    raise IntegrationError(f"El paso se volvió demasiado pequeño en x = {t:g} (posible singularidad)")
+                continue
+            norm = _error_norm(error, y, y_new, rtol, atol)
+            if norm <= 1.0:
+                t += direction * h_step
+                y, f0 = y_new, f_new
+                accumulated += float(np.max(np.abs(error)))
+                steps += 1
+                factor = 5.0 if norm == 0 else min(5.0, 0.9 * norm ** (-1 / order))
+                h = max(h, h_step * factor) if h_step < h else h_step * factor
+            else:
+                rejected += 1
+                h = h_step * max(0.2, 0.9 * norm ** (-1 / order))
+                if h < 1e-14 * max(1.0, abs(t)):
+                    raise IntegrationError(f"El paso se volvió demasiado pequeño en x = {t:g} (posible singularidad)")
+        ys[index] = y
+        errors[index] = accumulated
+
+    return {
+        't': t_eval,
+        'y': ys,
+        'error_estimate': errors,
+        'steps': steps,
+        'rejected': rejected,
+        'nfev': calls[0]
+    }
@@ -3,14 +3,161 @@ Módulo para resolver ecuaciones diferenciales ordinarias de primer orden
 Soporta: Variables separables, Homogéneas, Exactas, Lineales, Bernoulli, Factores integrantes
 """
 
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeout
+
+import numpy as np
 import sympy as sp
-from sympy import symbols, Function, Eq, dsolve, diff, integrate, simplify, exp, log, sqrt, latex
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application
-import re
+from sympy import symbols, Function, Eq, dsolve, diff, integrate, log, sqrt, latex
+
+from solve_cache import LRUCache, SolutionStore, key_digest
+from solve_worker import SolveWorker, SolveTimeout, SolveCancelled, WorkerCrashed
+from numeric_solver import integrate_ivp, IntegrationError
+from instrumentation import span, record, tracing, Profiler
+import closed_form
+import equation_parser
+
+
+_MISSING = object()
+
+# Métodos de resolución por nombre (los mismos identificadores que usa la GUI)
+SOLVE_METHODS = {
+    'general': 'solve_general',
+    'separable': 'solve_separable',
+    'homogeneous': 'solve_homogeneous',
+    'exact': 'solve_exact',
+    'linear': 'solve_linear',
+    'bernoulli': 'solve_bernoulli',
+    'integrating_factor': 'find_integrating_factor',
+    'second_order_const': 'solve_second_order_constant_coeff',
+    'reducible': 'solve_reducible_to_first_order',
+    'numeric': 'solve_numeric',
+    'race': 'solve_race'
+}
+
+# Hints de SymPy que implica cada método, por orden de preferencia; si ninguno
+# encaja con la ecuación se usa el hint por defecto de classify_ode. Con un hint
+# explícito classify_ode y dsolve solo prueban el emparejamiento de ese hint
+METHOD_HINTS = {
+    'separable': ('separable',),
+    'homogeneous': (
+        '1st_homogeneous_coeff_subs_dep_div_indep',
+        '1st_homogeneous_coeff_subs_indep_div_dep'
+    ),
+    'linear': ('1st_linear',),
+    'bernoulli': ('Bernoulli',),
+    'second_order_const': (
+        'nth_linear_constant_coeff_homogeneous',
+        'nth_linear_constant_coeff_undetermined_coefficients',
+        'nth_linear_constant_coeff_variation_of_parameters'
+    ),
+    'reducible': ('nth_order_reducible',),
+}
+
+# Métodos que reciben M(x,y) y N(x,y) en lugar de una ecuación
+MN_METHODS = ('exact', 'integrating_factor')
+
+# Modo carrera: tiempo máximo por defecto (segundos) y criterios de elección
+# ('first' = la primera solución correcta, 'simplest' = la de menor count_ops)
+RACE_DEADLINE = 60
+RACE_PICKS = ('first', 'simplest')
+
+# Rasgos estructurales de una ecuación usados para descartar casos especiales
+EquationShape = namedtuple('EquationShape', 'order functions degree poly')
+
+
+class SpecialCase(namedtuple('SpecialCase', 'name order degree label')):
+    """Caso especial registrado: solo se compara si la forma de la ecuación encaja"""
+
+    def accepts(self, shape):
+        return (
+            shape.order == self.order
+            and len(shape.functions) == 1
+            and (self.degree is None or shape.degree == self.degree)
+        )
+
+
+# Registro de casos especiales (métodos de ODESolver que devuelven (objetivo, solución))
+_SPECIAL_CASES = []
+
+
+def _special_case(order, degree=None, label=''):
+    def decorator(func):
+        _SPECIAL_CASES.append(SpecialCase(func.__name__, order, degree, label))
+        return func
+    return decorator
+
+# Solver propio de cada proceso del pool de solve_batch
+_batch_solver = None
+
+
+def _init_batch_worker(cache_size, store_path, timeout, simplify_steps, simplify_budget):
+    global _batch_solver
+    _batch_solver = ODESolver(cache_size=cache_size, store=store_path, timeout=timeout,
+                              simplify_steps=simplify_steps, simplify_budget=simplify_budget)
+
+
+def _solve_batch_item(spec):
+    return _batch_solver.solve_spec(spec)
+
+
+def _public_solve(method_label, numeric_fallback=True, bounded=True):
+    """
+    Envoltorio común de los métodos públicos de resolución:
+    - abre una traza con las duraciones por fase y las adjunta al resultado
+      ('timings' y 'hint'), notificando a los listeners del solver
+    - captura un perfil si ODESolver.profile está activado
+    - ejecuta el método en el subproceso trabajador cuando hay tiempo máximo
+      configurado (ODESolver.timeout), salvo con bounded=False (métodos que
+      gestionan sus propios subprocesos)
+    - si ODESolver.numeric_fallback está activado, recurre a la integración
+      numérica cuando la resolución simbólica no es posible o agota el tiempo
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with tracing() as (trace, owner):
+                profiler = profile_text = None
+                if owner and self.profile and self.timeout is None:
+                    try:
+                        profiler = Profiler(self.profile)
+                        profiler.start()
+                    except ImportError as e:
+                        profile_text = f"Perfilador '{self.profile}' no disponible: {e}"
+                start = time.perf_counter()
+                try:
+                    if self.timeout is None or not bounded:
+                        result = func(self, *args, **kwargs)
+                    else:
+                        result = self._run_bounded(func.__name__, method_label, args, kwargs)
+                    if numeric_fallback and self.numeric_fallback and self._wants_numeric_fallback(result):
+                        arguments = signature.bind(self, *args, **kwargs).arguments
+                        if 'equation_str' in arguments:
+                            result = self._numeric_fallback(arguments['equation_str'], arguments.get('initial_conditions'), result)
+                finally:
+                    if profiler is not None:
+                        profile_text = profiler.stop()
+                if not owner:
+                    return result
+                return self._attach_trace(result, trace, time.perf_counter() - start, profile_text)
+        return wrapper
+    return decorator
 
 
 class ODESolver:
-    def __init__(self):
+    def __init__(self, cache_size=256, store=None, timeout=None, numeric_fallback=False, profile=None,
+                 simplify_steps=closed_form.DEFAULT_SIMPLIFY_PIPELINE, simplify_budget=0.5,
+                 race=False, race_workers=None, race_pick='first'):
         self.x = symbols('x')
         self.y = Function('y')
         self.C1, self.C2 = symbols('C1 C2')
@@ -24,84 +171,374 @@ class ODESolver:
             'PI': sp.pi,
             'exp': sp.exp
         }
-        self.transformations = standard_transformations + (implicit_multiplication_application,)
+        # Ecuaciones ya parseadas (texto -> Eq)
+        self._parsed = LRUCache(512)
+        self._cache = LRUCache(cache_size)
+        # Almacén persistente opcional (ruta a un fichero SQLite o SolutionStore)
+        if store is not None and not isinstance(store, SolutionStore):
+            store = SolutionStore(store)
+        self.store = store
+        # Tiempo máximo (segundos) por resolución; None = sin límite. Al agotarse se
+        # termina el subproceso y se sustituye por uno de repuesto precalentado
+        self.timeout = timeout
+        self._worker = None
+        # Recurrir a la integración numérica si dsolve falla o agota el tiempo
+        self.numeric_fallback = numeric_fallback
+        # Funciones compiladas con lambdify (no se guardan en el almacén persistente)
+        self._compiled = LRUCache(64)
+        # Instrumentación: callbacks listener(fase, segundos, resultado) y perfilador
+        # opcional por resolución ('cprofile' o 'pyinstrument')
+        self.listeners = []
+        self.profile = profile
+        # Simplificación acotada de las soluciones: pasos (nombres de
+        # closed_form.SIMPLIFY_STEPS) y presupuesto en segundos
+        self.simplify_steps = tuple(simplify_steps)
+        self.simplify_budget = simplify_budget
+        self._special_targets = None
+        # Modo carrera del método general: los métodos candidatos se ejecutan a la
+        # vez en subprocesos y gana la primera solución (o la más simple)
+        if race_pick not in RACE_PICKS:
+            raise ValueError(f"race_pick debe ser uno de {RACE_PICKS}")
+        self.race = race
+        self.race_workers = race_workers
+        self.race_pick = race_pick
+        self._race_pool = []
+        self._race_lock = threading.Lock()
+    
+    def add_listener(self, callback):
+        """Registra callback(fase, segundos, resultado), llamado al terminar cada resolución"""
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        self.listeners.remove(callback)
+    
+    def _attach_trace(self, result, trace, elapsed, profile_text=None):
+        result = dict(result)
+        timings = dict(result.get('timings') or {})
+        timings.update(trace.timings)
+        timings['total'] = elapsed
+        result['timings'] = timings
+        for key, value in trace.info.items():
+            result.setdefault(key, value)
+        if profile_text is not None:
+            result['profile'] = profile_text
+        for callback in list(self.listeners):
+            for phase, seconds in timings.items():
+                callback(phase, seconds, result)
+        return result
+    
+    def _new_worker(self):
+        store_path = self.store.path if self.store is not None else None
+        return SolveWorker(cache_size=self._cache.maxsize, store=store_path, profile=self.profile,
+                           simplify_steps=self.simplify_steps, simplify_budget=self.simplify_budget)
+    
+    def _run_bounded(self, name, method_label, args, kwargs):
+        if self._worker is None:
+            self._worker = self._new_worker()
+        try:
+            return self._worker.call(name, args, kwargs, timeout=self.timeout)
+        except SolveTimeout:
+            return {
+                'success': False,
+                'error': 'timeout',
+                'method': method_label,
+                'timeout': self.timeout
+            }
+        except SolveCancelled:
+            return {
+                'success': False,
+                'error': 'cancelled',
+                'method': method_label
+            }
+        except (WorkerCrashed, RuntimeError) as e:
+            return {
+                'success': False,
+                'error': str(e) or 'El proceso de resolución terminó inesperadamente',
+                'method': method_label
+            }
+    
+    def cancel(self):
+        """Cancela la resolución en curso (solo con timeout configurado)"""
+        if self._worker is not None:
+            self._worker.cancel()
+        for worker in list(self._race_pool):
+            worker.cancel()
+    
+    def close(self):
+        """Termina los subprocesos trabajadores y cierra el almacén persistente"""
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+        with self._race_lock:
+            pool, self._race_pool = self._race_pool, []
+        for worker in pool:
+            worker.close()
+        if self.store is not None:
+            self.store.close()
+    
+    def cache_info(self):
+        """Devuelve los contadores (aciertos, fallos, expulsiones) de la caché de soluciones"""
+        info = self._cache.info()
+        info['parsed'] = self._parsed.info()
+        if self.store is not None:
+            info['store'] = self.store.info()
+        return info
+    
+    def clear_cache(self):
+        """Vacía la caché de soluciones en memoria (el almacén persistente se conserva)"""
+        self._cache.clear()
+        self._parsed.clear()
+    
+    def solve_spec(self, spec, method='general'):
+        """
+        Resuelve una especificación de ecuación
+        spec puede ser la cadena de la ecuación o un dict con las claves
+        'equation' (o 'M' y 'N'), 'method' e 'initial_conditions'
+        """
+        if isinstance(spec, str):
+            spec = {'equation': spec}
+        method = spec.get('method') or method
+        if method not in SOLVE_METHODS:
+            return {
+                'success': False,
+                'error': f'Método desconocido: {method}',
+                'method': method
+            }
+        solve = getattr(self, SOLVE_METHODS[method])
+        if method == 'general' and self.race:
+            solve = self.solve_race
+        if method in MN_METHODS:
+            return solve(spec.get('M', ''), spec.get('N', ''))
+        return solve(spec.get('equation', ''), initial_conditions=spec.get('initial_conditions'))
+    
+    def _normalize_spec(self, spec, method):
+        if isinstance(spec, str):
+            spec = {'equation': spec}
+        spec = dict(spec)
+        spec['method'] = spec.get('method') or method
+        for field in ('equation', 'M', 'N'):
+            if isinstance(spec.get(field), str):
+                spec[field] = spec[field].strip()
+        return spec
+    
+    def solve_batch(self, equations, method='general', workers=None, chunksize=None):
+        """
+        Resuelve una lista de ecuaciones en paralelo con un pool de procesos
+        Cada elemento es la cadena de la ecuación o un dict como los de solve_spec.
+        Las entradas idénticas se resuelven una sola vez y los resultados se
+        devuelven en el mismo orden que la entrada.
+        """
+        specs = [self._normalize_spec(spec, method) for spec in equations]
+        unique = {}
+        unique_specs = []
+        positions = []
+        for spec in specs:
+            key = json.dumps(spec, sort_keys=True, default=str)
+            if key not in unique:
+                unique[key] = len(unique_specs)
+                unique_specs.append(spec)
+            positions.append(unique[key])
+        
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, len(unique_specs))
+        if workers <= 1:
+            results = [self.solve_spec(spec) for spec in unique_specs]
+        else:
+            store_path = self.store.path if self.store is not None else None
+            if chunksize is None:
+                chunksize = max(1, len(unique_specs) // (workers * 4))
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_batch_worker,
+                    initargs=(self._cache.maxsize, store_path, self.timeout,
+                              self.simplify_steps, self.simplify_budget)
+                ) as executor:
+                    results = list(executor.map(_solve_batch_item, unique_specs, chunksize=chunksize))
+            except Exception as e:
+                return [
+                    {'success': False, 'error': str(e), 'method': spec['method']}
+                    for spec in specs
+                ]
+        return [dict(results[index]) for index in positions]
     
     def format_solution(self, solution):
         """
         Convierte la solución de SymPy a formato más legible
         """
-        # Convertir a string
-        sol_str = str(solution)
-        
-        # Si es una ecuación Eq(y(x), ...), extraer solo el lado derecho
-        if sol_str.startswith('Eq(y(x), '):
-            # Extraer la parte después de 'Eq(y(x), ' y antes del último ')'
-            rhs = sol_str[9:-1]
-            sol_str = f"y(x) = {rhs}"
-        
-        # Reemplazos para hacer más legible
-        sol_str = sol_str.replace('**', '^')
-        sol_str = sol_str.replace('*', '·')
-        sol_str = sol_str.replace('exp(', 'e^(')
-        sol_str = sol_str.replace('log(', 'ln(')
-        sol_str = sol_str.replace('sqrt(', '√(')
-        
-        return sol_str
+        with span('format'):
+            # Convertir a string
+            sol_str = str(solution)
+            
+            # Si es una ecuación Eq(y(x), ...), extraer solo el lado derecho
+            if sol_str.startswith('Eq(y(x), '):
+                # Extraer la parte después de 'Eq(y(x), ' y antes del último ')'
+                rhs = sol_str[9:-1]
+                sol_str = f"y(x) = {rhs}"
+            
+            # Reemplazos para hacer más legible
+            sol_str = sol_str.replace('**', '^')
+            sol_str = sol_str.replace('*', '·')
+            sol_str = sol_str.replace('exp(', 'e^(')
+            sol_str = sol_str.replace('log(', 'ln(')
+            sol_str = sol_str.replace('sqrt(', '√(')
+            
+            return sol_str
     
     def get_latex_solution(self, solution):
         """Convierte la solución a formato LaTeX legible"""
-        try:
-            if isinstance(solution, sp.Eq):
-                lhs = latex(solution.lhs)
-                rhs = latex(solution.rhs)
-                return f"{lhs} = {rhs}"
-            return latex(solution)
-        except Exception:
-            return str(solution)
+        with span('latex'):
+            try:
+                if isinstance(solution, sp.Eq):
+                    lhs = latex(solution.lhs)
+                    rhs = latex(solution.rhs)
+                    return f"{lhs} = {rhs}"
+                return latex(solution)
+            except Exception:
+                return str(solution)
     
     def parse_equation(self, equation_str):
         """
-        Parsea una ecuación diferencial en formato string
+        Parsea una ecuación diferencial en formato string y devuelve el Eq de SymPy
         Formatos aceptados:
         - dy/dx = f(x,y)
         - y' = f(x,y)
-        - y'' = f(x,y,y')
+        - y'' = f(x,y,y'), y''', d2y/dx2, ...
         - M(x,y) + N(x,y)*dy/dx = 0
         """
-        equation_str = equation_str.replace(' ', '')
-        # Reemplazar derivadas de segundo orden primero
-        equation_str = equation_str.replace("y''", "Derivative(y(x), x, 2)")
-        equation_str = equation_str.replace("d2y/dx2", "Derivative(y(x), x, 2)")
-        # Luego primeras derivadas
-        equation_str = equation_str.replace('dy/dx', "Derivative(y(x), x)")
-        equation_str = equation_str.replace("y'", "Derivative(y(x), x)")
-        # Reemplazar y -> y(x) incluso cuando está pegado a coeficientes, evitando dobles reemplazos
-        import re
-        placeholder = "__YFUNC__"
-        equation_str = equation_str.replace('y(x)', placeholder)
-        equation_str = re.sub(r'y(?!\()', 'y(x)', equation_str)
-        equation_str = equation_str.replace(placeholder, 'y(x)')
-        
-        return equation_str
+        return equation_parser.parse(equation_str, self.x, self.y, self.parse_locals)
 
-    def _parse(self, expr, local_dict=None):
-        """Helper para parsear expresiones habilitando multiplicación implícita"""
-        loc = local_dict or self.parse_locals
-        return parse_expr(expr, local_dict=loc, transformations=self.transformations)
+    def _build_equation(self, equation_str):
+        """Construye la ecuación de SymPy a partir del texto ingresado (cacheado por texto)"""
+        with span('parse'):
+            eq = self._parsed.get(equation_str, _MISSING)
+            if eq is _MISSING:
+                eq = self.parse_equation(equation_str)
+                self._parsed.put(equation_str, eq)
+            return eq
+    
+    def _parse_mn(self, M_str, N_str):
+        """Parsea M(x,y) y N(x,y) con y como símbolo (ecuaciones exactas y factores integrantes)"""
+        key = ('MN', M_str, N_str)
+        with span('parse'):
+            parsed = self._parsed.get(key, _MISSING)
+            if parsed is _MISSING:
+                names = dict(self.parse_locals, y=symbols('y'))
+                parsed = (
+                    equation_parser.parse(M_str, self.x, None, names),
+                    equation_parser.parse(N_str, self.x, None, names)
+                )
+                self._parsed.put(key, parsed)
+            return parsed
+    
+    def _canonical(self, eq):
+        """Forma canónica de la ecuación (lhs - rhs) usada como clave de caché"""
+        if isinstance(eq, sp.Equality):
+            return eq.lhs - eq.rhs
+        return eq
     
-    def _dsolve(self, eq, y, initial_conditions=None):
+    def _cached(self, key, compute, persist=True):
+        """
+        Devuelve el valor cacheado para key o lo calcula y lo guarda
+        Con persist=False solo se usa la caché en memoria (valores no serializables)
+        """
+        value = self._cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        digest = None
+        if self.store is not None and persist:
+            digest = key_digest(key)
+            value = self.store.get(digest, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            if digest is not None:
+                self.store.put(digest, value)
+        self._cache.put(key, value)
+        return value
+    
+    def _dsolve(self, eq, y, initial_conditions=None, method=None):
+        ics = self._prepare_ics(initial_conditions)
+        ics_key = frozenset(ics.items()) if ics else None
+        key = ('dsolve', method, self._canonical(eq), ics_key)
+        # El hint se guarda junto a la solución para registrarlo también en los aciertos de caché
+        hint, solution = self._cached(key, lambda: self._solve_with_hint(eq, y, ics, method))
+        if hint is not None:
+            record('hint', hint)
+        return solution
+    
+    def _simplify(self, expr):
+        """Simplificación acotada (pipeline y presupuesto configurables) en lugar de simplify"""
+        steps = tuple(step if isinstance(step, str) else step.__name__ for step in self.simplify_steps)
+        with span('simplify'):
+            return self._cached(
+                ('simplify', steps, self.simplify_budget, expr),
+                lambda: closed_form.simplify_bounded(expr, self.simplify_steps, self.simplify_budget)
+            )
+    
+    def _closed_form(self, engine, eq, initial_conditions=None, **options):
+        """
+        Ejecuta un motor de closed_form (cacheado como dsolve)
+        Devuelve su resultado o None si la ecuación no pertenece a la clase del motor.
+        """
         ics = self._prepare_ics(initial_conditions)
-        if ics:
-            return dsolve(eq, y, ics=ics)
-        return dsolve(eq, y)
+        ics_key = frozenset(ics.items()) if ics else None
+        key = ('closed_form', engine.__name__, self._canonical(eq), ics_key, tuple(sorted(options.items())))
+        with span('engine'):
+            return self._cached(key, lambda: engine(eq, self.x, self.y(self.x), ics, **options))
+    
+    def _solve_with_hint(self, eq, y, ics, method):
+        """
+        Resuelve con el hint que implica el método o, si no encaja (o falla), con el
+        hint por defecto de classify_ode. Devuelve (hint, solución).
+        """
+        for hint in METHOD_HINTS.get(method, ()):
+            if hint not in self._classification(eq, y, hint):
+                continue
+            with span('dsolve'):
+                try:
+                    solution = dsolve(eq, y, hint=hint, ics=ics)
+                except NotImplementedError:
+                    break
+            # Algunos hints producen soluciones degeneradas (zoo, nan): usar el hint por defecto
+            if not self._is_degenerate(solution):
+                return hint, solution
+            break
+        hint = self._classification(eq, y).get('default')
+        with span('dsolve'):
+            return hint, dsolve(eq, y, hint=hint or 'default', ics=ics)
+    
+    def _is_degenerate(self, solution):
+        solutions = solution if isinstance(solution, list) else [solution]
+        return any(s.has(sp.zoo, sp.nan, sp.oo, -sp.oo) for s in solutions)
+    
+    def _classification(self, eq, y, hint='default'):
+        """
+        classify_ode con dict=True limitado a hint: con 'default' se detiene en el
+        primer hint que encaja y con un hint concreto solo prueba ese
+        """
+        with span('classify'):
+            return self._cached(
+                ('classify', hint, self._canonical(eq)),
+                lambda: sp.classify_ode(eq, y, dict=True, hint=hint),
+                persist=False
+            )
+    
+    def _classify(self, eq, y):
+        """Hints de SymPy aplicables, en orden de preferencia (clasificación completa, cacheada)"""
+        with span('classify'):
+            return self._cached(('classify_hints', self._canonical(eq)), lambda: tuple(sp.classify_ode(eq, y)))
     
     def _prepare_ics(self, initial_conditions):
         if not initial_conditions:
             return None
-        x0 = initial_conditions.get('x0') if isinstance(initial_conditions, dict) else None
-        y0 = initial_conditions.get('y0') if isinstance(initial_conditions, dict) else None
-        yp0 = initial_conditions.get('yp0') if isinstance(initial_conditions, dict) else None
-        if not any([y0, yp0]):
+        if not isinstance(initial_conditions, dict):
+            return None
+        # Un valor ausente es None o un texto vacío; 0 es una condición válida
+        x0, y0, yp0 = (
+            None if value is None or (isinstance(value, str) and not value.strip()) else value
+            for value in (initial_conditions.get(name) for name in ('x0', 'y0', 'yp0'))
+        )
+        if y0 is None and yp0 is None:
             return None
         if x0 is None:
             raise ValueError("Debe especificar x0 para aplicar condiciones iniciales")
@@ -116,28 +553,20 @@ class ODESolver:
         except (sp.SympifyError, ValueError) as exc:
             raise ValueError(f"Condiciones iniciales inválidas: {exc}")
     
+    @_public_solve('Variables Separables')
     def solve_separable(self, equation_str, initial_conditions=None):
         """
         Resuelve ecuaciones de variables separables: dy/dx = f(x)g(y)
         """
         try:
             y = self.y(self.x)
-            eq_str = self.parse_equation(equation_str)
-            
-            # Intentar resolver con dsolve
-            if '=' in eq_str:
-                parts = eq_str.split('=')
-                lhs = self._parse(parts[0])
-                rhs = self._parse(parts[1])
-                eq = Eq(lhs, rhs)
-            else:
-                eq = self._parse(eq_str)
+            eq = self._build_equation(equation_str)
             
             special_solution = self._solve_special_cases(eq)
             if special_solution:
                 return special_solution
             
-            solution = self._dsolve(eq, y, initial_conditions)
+            solution = self._dsolve(eq, y, initial_conditions, method='separable')
             
             # Simplificar la solución
             if isinstance(solution, list):
@@ -154,51 +583,61 @@ class ODESolver:
             return {
                 'success': False,
                 'error': str(e),
+                'error_type': type(e).__name__,
                 'method': 'Variables Separables'
             }
     
+    @_public_solve('Ecuación Homogénea')
     def solve_homogeneous(self, equation_str, initial_conditions=None):
         """
         Resuelve ecuaciones homogéneas: dy/dx = f(y/x)
         """
         try:
             y = self.y(self.x)
-            eq_str = self.parse_equation(equation_str)
-            
-            if '=' in eq_str:
-                parts = eq_str.split('=')
-                lhs = self._parse(parts[0])
-                rhs = self._parse(parts[1])
-                eq = Eq(lhs, rhs)
-            else:
-                eq = self._parse(eq_str)
+            eq = self._build_equation(equation_str)
             
             special_solution = self._solve_special_cases(eq)
             if special_solution:
                 return special_solution
             
-            solution = self._dsolve(eq, y, initial_conditions)
+            # Motor directo: v = y/x reduce la ecuación a una separable; dsolve solo si no encaja
+            fast = self._closed_form(closed_form.solve_homogeneous, eq, initial_conditions)
+            if fast is not None:
+                solution = fast['solution']
+                details = {
+                    'engine': 'homogeneous_substitution',
+                    'substitution': fast['substitution'],
+                    'reduced_equation': str(fast['reduced'])
+                }
+            else:
+                solution = self._dsolve(eq, y, initial_conditions, method='homogeneous')
+                details = {'engine': 'dsolve'}
             
             # Simplificar la solución
             if isinstance(solution, list):
+                if not solution:
+                    raise ValueError("Las condiciones iniciales no son compatibles con la solución")
                 solution = solution[0]
             
-            solution_simplified = simplify(solution)
+            solution_simplified = self._simplify(solution)
             
             return {
                 'success': True,
                 'solution': str(solution_simplified),
                 'solution_formatted': self.format_solution(solution_simplified),
                 'solution_latex': self.get_latex_solution(solution_simplified),
-                'method': 'Ecuación Homogénea'
+                'method': 'Ecuación Homogénea',
+                **details
             }
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e),
+                'error_type': type(e).__name__,
                 'method': 'Ecuación Homogénea'
             }
     
+    @_public_solve('Ecuación Exacta')
     def solve_exact(self, M_str, N_str):
         """
         Resuelve ecuaciones exactas: M(x,y)dx + N(x,y)dy = 0
@@ -206,29 +645,26 @@ class ODESolver:
         """
         try:
             x, y = self.x, symbols('y')
+            M, N = self._parse_mn(M_str, N_str)
             
-            M_str = M_str.replace('y', 'y').replace('x', 'x')
-            N_str = N_str.replace('y', 'y').replace('x', 'x')
-            
-            local_symbols = {'x': x, 'y': y, 'E': sp.E, 'e': sp.E, 'pi': sp.pi, 'PI': sp.pi, 'exp': sp.exp}
-            M = self._parse(M_str, local_dict=local_symbols)
-            N = self._parse(N_str, local_dict=local_symbols)
-            
-            # Verificar si es exacta
-            dM_dy = diff(M, y)
-            dN_dx = diff(N, x)
-            
-            is_exact = simplify(dM_dy - dN_dx) == 0
+            # Verificar si es exacta (forma normal o evaluación numérica antes que simplify)
+            # y construir la función potencial F(x,y) con integrales especializadas
+            with span('engine'):
+                exact = self._cached(('exact', M, N), lambda: closed_form.solve_exact(M, N, x, y))
+            dM_dy, dN_dx = exact['dM_dy'], exact['dN_dx']
             
-            if is_exact:
-                # Encontrar la función potencial F(x,y)
-                F = integrate(M, x)
-                # Agregar términos que dependen solo de y
-                g_y = integrate(N - diff(F, y), y)
-                F = F + g_y
+            if exact['is_exact']:
+                F = exact['potential']
+                if F is None:
+                    with span('integrate'):
+                        # Encontrar la función potencial F(x,y)
+                        F = integrate(M, x)
+                        # Agregar términos que dependen solo de y
+                        g_y = integrate(N - diff(F, y), y)
+                        F = F + g_y
                 
                 solution = f"F(x,y) = {F} = C"
-                solution_eq = Eq(sp.simplify(F), sp.Symbol('C'))
+                solution_eq = Eq(F, sp.Symbol('C'))
                 
                 return {
                     'success': True,
@@ -236,7 +672,9 @@ class ODESolver:
                     'solution_formatted': self.format_solution(solution_eq),
                     'solution_latex': self.get_latex_solution(solution_eq),
                     'method': 'Ecuación Exacta',
-                    'is_exact': True
+                    'is_exact': True,
+                    'exactness_check': exact['check'],
+                    'engine': 'potential_function' if exact['potential'] is not None else 'integrate'
                 }
             else:
                 return {
@@ -244,6 +682,7 @@ class ODESolver:
                     'error': f'La ecuación no es exacta. ∂M/∂y = {dM_dy}, ∂N/∂x = {dN_dx}',
                     'method': 'Ecuación Exacta',
                     'is_exact': False,
+                    'exactness_check': exact['check'],
                     'dM_dy': str(dM_dy),
                     'dN_dx': str(dN_dx)
                 }
@@ -254,23 +693,28 @@ class ODESolver:
                 'method': 'Ecuación Exacta'
             }
     
+    @_public_solve('Ecuación Lineal')
     def solve_linear(self, equation_str, initial_conditions=None):
         """
         Resuelve ecuaciones lineales: dy/dx + P(x)y = Q(x)
         """
         try:
             y = self.y(self.x)
-            eq_str = self.parse_equation(equation_str)
+            eq = self._build_equation(equation_str)
             
-            if '=' in eq_str:
-                parts = eq_str.split('=')
-                lhs = self._parse(parts[0])
-                rhs = self._parse(parts[1])
-                eq = Eq(lhs, rhs)
+            # Motor directo: μ = exp(∫P), y = (∫μQ + C)/μ; dsolve solo si no encaja
+            fast = self._closed_form(closed_form.solve_first_order_linear, eq, initial_conditions)
+            if fast is not None:
+                solution = fast['solution']
+                details = {
+                    'engine': 'integrating_factor',
+                    'P': str(fast['P']),
+                    'Q': str(fast['Q']),
+                    'integrating_factor': str(fast['integrating_factor'])
+                }
             else:
-                eq = self._parse(eq_str)
-            
-            solution = self._dsolve(eq, y, initial_conditions)
+                solution = self._dsolve(eq, y, initial_conditions, method='linear')
+                details = {'engine': 'dsolve'}
             
             # Simplificar la solución
             if isinstance(solution, list):
@@ -281,35 +725,45 @@ class ODESolver:
                 'solution': str(solution),
                 'solution_formatted': self.format_solution(solution),
                 'solution_latex': self.get_latex_solution(solution),
-                'method': 'Ecuación Lineal'
+                'method': 'Ecuación Lineal',
+                **details
             }
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e),
+                'error_type': type(e).__name__,
                 'method': 'Ecuación Lineal'
             }
     
+    @_public_solve('Ecuación de Bernoulli')
     def solve_bernoulli(self, equation_str, n=None, initial_conditions=None):
         """
         Resuelve ecuaciones de Bernoulli: dy/dx + P(x)y = Q(x)y^n
+        Si no se indica n, se detecta a partir de las potencias de y.
         """
         try:
             y = self.y(self.x)
-            eq_str = self.parse_equation(equation_str)
+            eq = self._build_equation(equation_str)
             
-            if '=' in eq_str:
-                parts = eq_str.split('=')
-                lhs = self._parse(parts[0])
-                rhs = self._parse(parts[1])
-                eq = Eq(lhs, rhs)
+            # Motor directo: v = y^(1-n) convierte la ecuación en lineal; dsolve solo si no encaja
+            fast = self._closed_form(closed_form.solve_bernoulli, eq, initial_conditions, n=n)
+            if fast is not None:
+                solution = fast['solution']
+                details = {
+                    'engine': 'bernoulli_substitution',
+                    'n': str(fast['n']),
+                    'P': str(fast['P']),
+                    'Q': str(fast['Q'])
+                }
             else:
-                eq = self._parse(eq_str)
+                solution = self._dsolve(eq, y, initial_conditions, method='bernoulli')
+                details = {'engine': 'dsolve'}
             
-            solution = self._dsolve(eq, y, initial_conditions)
-            
-            # Simplificar la solución
+            # Con exponente fraccionario puede haber varias ramas: se muestra la primera
             if isinstance(solution, list):
+                if len(solution) > 1:
+                    details['branches'] = [str(branch) for branch in solution]
                 solution = solution[0]
             
             return {
@@ -317,74 +771,71 @@ class ODESolver:
                 'solution': str(solution),
                 'solution_formatted': self.format_solution(solution),
                 'solution_latex': self.get_latex_solution(solution),
-                'method': 'Ecuación de Bernoulli'
+                'method': 'Ecuación de Bernoulli',
+                **details
             }
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e),
+                'error_type': type(e).__name__,
                 'method': 'Ecuación de Bernoulli'
             }
     
+    @_public_solve('Factor Integrante')
     def find_integrating_factor(self, M_str, N_str):
         """
         Encuentra factor integrante para ecuaciones no exactas
+        Candidatos: μ(x), μ(y), μ(xy), μ(x+y) y μ = x^a·y^b; con μ hallado se
+        resuelve también la ecuación exacta μM dx + μN dy = 0.
         """
         try:
             x, y = self.x, symbols('y')
+            M, N = self._parse_mn(M_str, N_str)
             
-            local_dict = {'x': x, 'y': y, 'E': sp.E, 'e': sp.E, 'pi': sp.pi, 'PI': sp.pi, 'exp': sp.exp}
-            M = self._parse(M_str, local_dict=local_dict)
-            N = self._parse(N_str, local_dict=local_dict)
-            
-            dM_dy = diff(M, y)
-            dN_dx = diff(N, x)
+            # Buscar μ entre μ(x), μ(y), μ(xy), μ(x+y) y x^a·y^b (descartes numéricos
+            # antes del trabajo simbólico) y resolver la ecuación exacta resultante
+            with span('engine'):
+                search = self._cached(
+                    ('integrating_factor', M, N),
+                    lambda: closed_form.find_integrating_factor(M, N, x, y)
+                )
+            candidates = [
+                {'candidate': c['candidate'], 'status': c['status'], 'seconds': c['seconds']}
+                for c in search['candidates']
+            ]
             
-            # Intentar factor integrante que depende solo de x
-            try:
-                factor_x = (dM_dy - dN_dx) / N
-                factor_x_simplified = simplify(factor_x)
-                
-                if not factor_x_simplified.has(y):
-                    mu = exp(integrate(factor_x_simplified, x))
-                    mu_str = str(mu)
-                    return {
-                        'success': True,
-                        'factor': mu_str,
-                        'type': 'μ(x)',
-                        'method': 'Factor Integrante',
-                        'solution': f"μ(x) = {mu_str}",
-                        'solution_formatted': f"μ(x) = {mu_str}",
-                        'solution_latex': f"\\mu(x) = {latex(mu)}"
-                    }
-            except:
-                pass
-            
-            # Intentar factor integrante que depende solo de y
-            try:
-                factor_y = (dN_dx - dM_dy) / M
-                factor_y_simplified = simplify(factor_y)
-                
-                if not factor_y_simplified.has(x):
-                    mu = exp(integrate(factor_y_simplified, y))
-                    mu_str = str(mu)
-                    return {
-                        'success': True,
-                        'factor': mu_str,
-                        'type': 'μ(y)',
-                        'method': 'Factor Integrante',
-                        'solution': f"μ(y) = {mu_str}",
-                        'solution_formatted': f"μ(y) = {mu_str}",
-                        'solution_latex': f"\\mu(y) = {latex(mu)}"
-                    }
-            except:
-                pass
+            mu = search['factor']
+            if mu is None:
+                return {
+                    'success': False,
+                    'error': 'No se encontró un factor integrante simple',
+                    'method': 'Factor Integrante',
+                    'candidates': candidates
+                }
             
-            return {
-                'success': False,
-                'error': 'No se encontró un factor integrante simple',
-                'method': 'Factor Integrante'
+            mu_str = str(mu)
+            label = search['type']
+            label_latex = label.replace('μ', '\\mu').replace('·', ' ')
+            result = {
+                'success': True,
+                'factor': mu_str,
+                'type': label,
+                'method': 'Factor Integrante',
+                'solution': f"{label} = {mu_str}",
+                'solution_formatted': f"{label} = {mu_str}",
+                'solution_latex': f"{label_latex} = {latex(mu)}",
+                'candidates': candidates
             }
+            F = search['exact']['potential']
+            if F is not None:
+                # Solución de la ecuación exacta μM dx + μN dy = 0
+                solution_eq = Eq(F, sp.Symbol('C'))
+                result['exact_solution'] = f"F(x,y) = {F} = C"
+                result['solution'] += f"; F(x,y) = {F} = C"
+                result['solution_formatted'] += f"; {self.format_solution(solution_eq)}"
+                result['solution_latex'] += f", \\quad {self.get_latex_solution(solution_eq)}"
+            return result
         except Exception as e:
             return {
                 'success': False,
@@ -392,30 +843,23 @@ class ODESolver:
                 'method': 'Factor Integrante'
             }
     
+    @_public_solve('Método General')
     def solve_general(self, equation_str, initial_conditions=None):
         """
         Intenta resolver la ecuación con el método general de SymPy
         """
         try:
             y = self.y(self.x)
-            eq_str = self.parse_equation(equation_str)
-            
-            if '=' in eq_str:
-                parts = eq_str.split('=')
-                lhs = self._parse(parts[0])
-                rhs = self._parse(parts[1])
-                eq = Eq(lhs, rhs)
-            else:
-                eq = self._parse(eq_str)
+            eq = self._build_equation(equation_str)
             
             special_solution = self._solve_special_cases(eq)
             if special_solution:
                 return special_solution
             
-            solution = self._dsolve(eq, y, initial_conditions)
+            solution = self._dsolve(eq, y, initial_conditions, method='general')
             
             # Obtener el tipo de ecuación
-            hints = sp.classify_ode(eq, y)
+            hints = self._classify(eq, y)
             
             return {
                 'success': True,
@@ -429,31 +873,224 @@ class ODESolver:
             return {
                 'success': False,
                 'error': str(e),
+                'error_type': type(e).__name__,
                 'method': 'Método General'
             }
     
+    @_public_solve('Carrera de Métodos', bounded=False)
+    def solve_race(self, equation_str, initial_conditions=None, methods=None, deadline=None, pick=None):
+        """
+        Modo carrera del método general: ejecuta a la vez, cada uno en su
+        subproceso, los métodos candidatos que encajan con la forma de la ecuación
+        (o los indicados en methods) y cancela los que pierden.
+        Con pick='first' gana la primera solución correcta; con pick='simplest'
+        se espera a todos (hasta deadline segundos) y gana la de menor count_ops.
+        """
+        pick = pick or self.race_pick
+        if pick not in RACE_PICKS:
+            raise ValueError(f"pick debe ser uno de {RACE_PICKS}")
+        if deadline is None:
+            deadline = self.timeout if self.timeout is not None else RACE_DEADLINE
+        try:
+            if methods is None:
+                with span('race_candidates'):
+                    methods = self._race_candidates(self._build_equation(equation_str))
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': type(e).__name__,
+                'method': 'Carrera de Métodos'
+            }
+        
+        with span('race'):
+            outcomes = self._race(methods, equation_str, initial_conditions, deadline, pick)
+        report = [
+            {key: outcome[key] for key in ('method', 'status', 'seconds', 'complexity') if key in outcome}
+            for outcome in outcomes
+        ]
+        winners = [outcome for outcome in outcomes if outcome['status'] == 'success']
+        if winners:
+            if pick == 'simplest':
+                winner = min(winners, key=lambda outcome: outcome['complexity'])
+            else:
+                winner = min(winners, key=lambda outcome: outcome['finished'])
+            for entry, outcome in zip(report, outcomes):
+                if outcome is winner:
+                    entry['status'] = 'won'
+            result = dict(winner['result'])
+            result['race'] = {'winner': winner['method'], 'pick': pick, 'candidates': report}
+            return result
+        
+        statuses = {outcome['status'] for outcome in outcomes}
+        timed_out = statuses <= {'timeout', 'cancelled'} and 'timeout' in statuses
+        if statuses == {'cancelled'}:
+            error = 'cancelled'
+        elif timed_out:
+            error = 'timeout'
+        else:
+            errors = '; '.join(
+                f"{outcome['method']}: {outcome['result'].get('error')}"
+                for outcome in outcomes if outcome.get('result')
+            )
+            error = f'Ningún método encontró una solución ({errors})'
+        return {
+            'success': False,
+            'error': error,
+            'method': 'Carrera de Métodos',
+            'timeout': deadline if timed_out else None,
+            'race': {'winner': None, 'pick': pick, 'candidates': report}
+        }
+    
+    def _race_candidates(self, eq):
+        """
+        Métodos que compiten en la carrera: solo aquellos cuyo motor directo
+        reconoce la forma de la ecuación (comprobaciones baratas), más el general
+        """
+        y = self.y(self.x)
+        expr = eq.lhs - eq.rhs
+        order = closed_form.order_of(expr, y)
+        candidates = []
+        if order == 1:
+            if closed_form.linear_first_order_parts(eq, self.x, y) is not None:
+                candidates.append('linear')
+            if closed_form.bernoulli_parts(eq, self.x, y) is not None:
+                candidates.append('bernoulli')
+            slope = closed_form.explicit_slope(eq, self.x, y)
+            if slope is not None:
+                v = sp.Dummy('v')
+                if sp.separatevars(slope.subs(y, v), [self.x, v], dict=True) is not None:
+                    candidates.append('separable')
+            if closed_form.homogeneous_slope(eq, self.x, y)[0] is not None:
+                candidates.append('homogeneous')
+        elif order > 1:
+            matched = closed_form.linear_coefficients(expr, self.x, y, order)
+            if matched is not None and not any(c.has(self.x) for c in matched[0]):
+                candidates.append('second_order_const')
+            candidates.append('reducible')
+        candidates.append('general')
+        return candidates
+    
+    def _race(self, methods, equation_str, initial_conditions, deadline, pick):
+        """
+        Ejecuta los métodos en los subprocesos de la carrera y devuelve un
+        resultado por método: {'method', 'status', 'seconds', 'result', ...}
+        """
+        size = self.race_workers or max(2, os.cpu_count() or 1)
+        size = max(1, min(size, len(methods)))
+        with self._race_lock:
+            while len(self._race_pool) < size:
+                self._race_pool.append(self._new_worker())
+            free = queue.Queue()
+            for worker in self._race_pool[:size]:
+                free.put(worker)
+        
+        start = time.perf_counter()
+        stop = threading.Event()
+        state = threading.Lock()
+        running = {}
+        
+        def run(method):
+            outcome = {'method': method, 'status': 'cancelled'}
+            worker = free.get()
+            try:
+                remaining = deadline - (time.perf_counter() - start)
+                if remaining <= 0:
+                    outcome['status'] = 'timeout'
+                    return outcome
+                with state:
+                    if stop.is_set():
+                        return outcome
+                    # Con el identificador de la llamada, cancelar a un perdedor no
+                    # afecta a la siguiente llamada que reciba el mismo subproceso
+                    job = worker.new_job()
+                    running[method] = (worker, job)
+                try:
+                    result = worker.call(SOLVE_METHODS[method], (equation_str,),
+                                         {'initial_conditions': initial_conditions}, timeout=remaining, job=job)
+                except SolveTimeout:
+                    outcome['status'] = 'timeout'
+                except SolveCancelled:
+                    outcome['status'] = 'cancelled'
+                except (WorkerCrashed, RuntimeError) as e:
+                    outcome.update(status='error', result={'error': str(e) or 'El proceso terminó inesperadamente'})
+                else:
+                    outcome['result'] = result
+                    outcome['status'] = 'success' if result.get('success') else 'error'
+                    if result.get('success') and pick == 'simplest':
+                        outcome['complexity'] = self._complexity(result)
+                outcome['seconds'] = time.perf_counter() - start
+                outcome['finished'] = time.perf_counter()
+                return outcome
+            finally:
+                with state:
+                    running.pop(method, None)
+                free.put(worker)
+        
+        def stop_losers():
+            with state:
+                stop.set()
+                losers = list(running.values())
+            for worker, job in losers:
+                worker.cancel(job)
+        
+        executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='race')
+        futures = {executor.submit(run, method): method for method in methods}
+        outcomes = {}
+        expired = False
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                outcome = future.result()
+                outcomes[outcome['method']] = outcome
+                if outcome['status'] == 'success' and pick == 'first':
+                    break
+        except FuturesTimeout:
+            expired = True
+        finally:
+            stop_losers()
+            executor.shutdown(wait=False, cancel_futures=True)
+        for method in methods:
+            if method not in outcomes:
+                # Los que no terminaron a tiempo o se cancelaron al haber ganador
+                outcomes[method] = {'method': method, 'status': 'timeout' if expired else 'cancelled'}
+        return [outcomes[method] for method in methods]
+    
+    def _complexity(self, result):
+        """Medida de complejidad de una solución (count_ops de la expresión)"""
+        try:
+            solution = sp.sympify(result['solution'], locals={'x': self.x, 'y': self.y})
+        except (sp.SympifyError, TypeError, SyntaxError):
+            return len(result.get('solution') or '')
+        return sp.count_ops(solution)
+    
+    @_public_solve('Ecuación de Segundo Orden con Coeficientes Constantes')
     def solve_second_order_constant_coeff(self, equation_str, initial_conditions=None):
         """
         Resuelve ecuaciones lineales de segundo orden con coeficientes constantes
         ay'' + by' + cy = 0 o ay'' + by' + cy = g(x)
+        (el motor del polinomio característico admite también orden n)
         """
         try:
             y = self.y(self.x)
-            eq_str = self.parse_equation(equation_str)
+            eq = self._build_equation(equation_str)
             
-            if '=' in eq_str:
-                parts = eq_str.split('=')
-                lhs = self._parse(parts[0])
-                rhs = self._parse(parts[1])
-                eq = Eq(lhs, rhs)
+            # Motor directo (polinomio característico); dsolve solo si la ecuación no encaja
+            fast = self._closed_form(closed_form.solve_constant_coefficients, eq, initial_conditions)
+            if fast is not None:
+                solution = fast['solution']
+                is_homogeneous = fast['homogeneous']
+                details = {
+                    'engine': 'characteristic_polynomial',
+                    'roots': fast['roots'],
+                    'particular_method': fast['particular_method']
+                }
             else:
-                eq = self._parse(eq_str)
-            
-            solution = dsolve(eq, y)
-            
-            # Obtener coeficientes para ecuación característica
-            hints = sp.classify_ode(eq, y)
-            is_homogeneous = 'nth_linear_constant_coeff_homogeneous' in hints
+                solution = self._dsolve(eq, y, initial_conditions, method='second_order_const')
+                
+                # Obtener coeficientes para ecuación característica
+                hints = self._classify(eq, y)
+                is_homogeneous = 'nth_linear_constant_coeff_homogeneous' in hints
+                details = {'engine': 'dsolve'}
             
             return {
                 'success': True,
@@ -461,15 +1098,18 @@ class ODESolver:
                 'solution_formatted': self.format_solution(solution),
                 'solution_latex': self.get_latex_solution(solution),
                 'method': 'Ecuación de Segundo Orden con Coeficientes Constantes',
-                'is_homogeneous': is_homogeneous
+                'is_homogeneous': is_homogeneous,
+                **details
             }
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e),
+                'error_type': type(e).__name__,
                 'method': 'Ecuación de Segundo Orden con Coeficientes Constantes'
             }
     
+    @_public_solve('Ecuación Reducible a Primer Orden')
     def solve_reducible_to_first_order(self, equation_str, case_type='general', initial_conditions=None):
         """
         Resuelve ecuaciones reducibles a primer orden
@@ -477,17 +1117,9 @@ class ODESolver:
         """
         try:
             y = self.y(self.x)
-            eq_str = self.parse_equation(equation_str)
+            eq = self._build_equation(equation_str)
             
-            if '=' in eq_str:
-                parts = eq_str.split('=')
-                lhs = self._parse(parts[0])
-                rhs = self._parse(parts[1])
-                eq = Eq(lhs, rhs)
-            else:
-                eq = self._parse(eq_str)
-            
-            solution = dsolve(eq, y)
+            solution = self._dsolve(eq, y, initial_conditions, method='reducible')
             
             return {
                 'success': True,
@@ -500,34 +1132,433 @@ class ODESolver:
             return {
                 'success': False,
                 'error': str(e),
+                'error_type': type(e).__name__,
                 'method': 'Ecuación Reducible a Primer Orden'
             }
     
-    def _solve_special_cases(self, eq):
-        """Intenta resolver casos especiales no cubiertos por SymPy"""
-        handlers = (
-            self._solve_case_y_times_ypp_plus_yp_sq,
-        )
-        for handler in handlers:
-            result = handler(eq)
-            if result:
-                return result
-        return None
-
-    def _solve_case_y_times_ypp_plus_yp_sq(self, eq):
+    @_public_solve('Solución Numérica', numeric_fallback=False)
+    def solve_numeric(self, equation_str, initial_conditions=None, x_end=None, integrator='auto',
+                      num_points=200, rtol=1e-6, atol=1e-9):
+        """
+        Resuelve numéricamente el problema de valor inicial
+        La ecuación se despeja para la derivada de mayor orden, se convierte en un
+        sistema de primer orden compilado con lambdify y se integra desde x0 hasta
+        x_end con RK45 o Radau ('auto' prueba RK45 y pasa a Radau si es rígida).
+        """
+        try:
+            eq = self._build_equation(equation_str)
+            system, order = self._first_order_system(eq)
+            x0, state0 = self._numeric_ics(initial_conditions, order)
+            if x_end is None:
+                x_end = x0 + 5
+            x_end = float(sp.sympify(x_end))
+            xs = np.linspace(x0, x_end, num_points)
+            
+            with span('integrate'):
+                if integrator == 'auto':
+                    try:
+                        data = integrate_ivp(system, x0, state0, xs[1:], method='RK45', rtol=rtol, atol=atol, max_steps=5000)
+                        integrator = 'RK45'
+                    except IntegrationError:
+                        data = integrate_ivp(system, x0, state0, xs[1:], method='Radau', rtol=rtol, atol=atol)
+                        integrator = 'Radau'
+                else:
+                    data = integrate_ivp(system, x0, state0, xs[1:], method=integrator, rtol=rtol, atol=atol)
+            
+            states = np.vstack([state0, data['y']])
+            error_estimate = np.concatenate([[0.0], data['error_estimate']])
+            description = f"Solución numérica ({integrator}) en [{x0:g}, {x_end:g}]"
+            result = {
+                'success': True,
+                'solution': description,
+                'solution_formatted': f"y(x) ≈ {description}",
+                'solution_latex': f"y(x) \\approx \\mathrm{{{integrator}}},\\ x \\in [{x0:g}, {x_end:g}]",
+                'method': 'Solución Numérica',
+                'numeric': True,
+                'integrator': integrator,
+                'x': xs,
+                'y': states[:, 0],
+                'error_estimate': error_estimate,
+                'max_error_estimate': float(error_estimate[-1]),
+                'steps': data['steps'],
+                'nfev': data['nfev']
+            }
+            if order >= 2:
+                result['yp'] = states[:, 1]
+            return result
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': type(e).__name__,
+                'method': 'Solución Numérica'
+            }
+    
+    def compile_solution(self, result, branch=0):
+        """
+        Compila (una sola vez) la solución explícita de un resultado a una función NumPy
+        Devuelve (f, constants): f(xs, *valores_constantes) evalúa la solución de forma
+        vectorizada y constants es la lista ordenada de nombres (C1, C2, ...).
+        """
+        solution = result.get('solution') if isinstance(result, dict) else result
+        if not solution or (isinstance(result, dict) and not result.get('success', True)):
+            raise ValueError("El resultado no contiene una solución")
+        key = ('solution', str(solution), branch)
+        cached = self._compiled.get(key)
+        if cached is not None:
+            return cached
+        
+        rhs = self._explicit_solution(solution, branch)
+        constants = sorted((s for s in rhs.free_symbols if s != self.x), key=lambda s: s.name)
+        f = sp.lambdify((self.x, *constants), rhs, 'numpy')
+        compiled = (f, [c.name for c in constants])
+        self._compiled.put(key, compiled)
+        return compiled
+    
+    def compile_slope(self, equation_str):
+        """
+        Compila (una sola vez) la pendiente F(x, y) de una ecuación de primer orden y' = F(x, y)
+        Devuelve f(xs, ys) vectorizada con NumPy: con las matrices de una malla NxN
+        calcula todo el campo de pendientes en una sola llamada (NaN donde F no es real).
+        """
+        key = ('slope', equation_str.strip())
+        cached = self._compiled.get(key)
+        if cached is not None:
+            return cached
+        
         y = self.y(self.x)
-        if isinstance(eq, sp.Equality):
-            expr = sp.simplify(eq.lhs - eq.rhs)
-        else:
-            expr = sp.simplify(eq)
-        target = sp.simplify(sp.diff(y * diff(y, self.x), self.x))
-        if sp.simplify(expr - target) == 0:
-            solution_eq = Eq(y**2, self.C1 * self.x + self.C2)
+        F = closed_form.explicit_slope(self._build_equation(equation_str), self.x, y)
+        if F is None:
+            raise ValueError("El campo de pendientes requiere una ecuación de primer orden y' = F(x, y)")
+        y_symbol = sp.Symbol('y')
+        f = sp.lambdify((self.x, y_symbol), F.subs(y, y_symbol), 'numpy')
+        
+        def slope(xs, ys):
+            xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+            with np.errstate(all='ignore'):
+                values = np.broadcast_to(f(xs, ys), xs.shape)
+            if np.iscomplexobj(values):
+                values = np.where(np.abs(values.imag) < 1e-12, values.real, np.nan)
+            return np.asarray(values, dtype=float)
+        
+        self._compiled.put(key, slope)
+        return slope
+    
+    def _explicit_solution(self, solution, branch=0):
+        """Lado derecho y(x) = ... de una solución (en texto) despejando si es implícita"""
+        y = self.y(self.x)
+        try:
+            parsed = sp.sympify(str(solution), locals={'x': self.x, 'y': self.y})
+        except (sp.SympifyError, SyntaxError, TypeError):
+            raise ValueError("La solución no es una expresión explícita evaluable")
+        solutions = list(parsed) if isinstance(parsed, (list, tuple)) else [parsed]
+        explicit = []
+        for sol in solutions:
+            if isinstance(sol, sp.Equality) and sol.lhs == y:
+                explicit.append(sol.rhs)
+            elif isinstance(sol, sp.Equality) and sol.has(y):
+                # Soluciones implícitas: intentar despejar y(x)
+                explicit.extend(sp.solve(sol, y))
+        if branch >= len(explicit):
+            raise ValueError("La solución no es explícita en y(x)")
+        rhs = explicit[branch]
+        if rhs.has(self.y) or rhs.has(sp.Integral):
+            raise ValueError("La solución contiene y(x) o integrales sin evaluar")
+        return rhs
+    
+    def evaluate(self, result, xs, constants=None, branch=0):
+        """
+        Evalúa la solución en un arreglo de puntos x en una sola llamada vectorizada
+        constants asigna valores (escalares o arreglos) a C1, C2, ...; los arreglos se
+        combinan con xs mediante broadcasting de NumPy, por ejemplo
+        evaluate(r, np.linspace(0, 1, 100), {'C1': np.array([[1], [2], [3]])})
+        devuelve una matriz 3x100 con una curva por valor de C1.
+        """
+        xs = np.asarray(xs, dtype=float)
+        if isinstance(result, dict) and result.get('numeric'):
+            return np.interp(xs, result['x'], result['y'], left=np.nan, right=np.nan)
+        f, names = self.compile_solution(result, branch=branch)
+        constants = constants or {}
+        missing = [name for name in names if name not in constants]
+        if missing:
+            raise ValueError(f"Faltan valores para las constantes: {', '.join(missing)}")
+        args = [np.asarray(constants[name]) for name in names]
+        values = f(xs, *args)
+        return np.broadcast_arrays(values, xs, *args)[0]
+    
+    def solve_sweep(self, equation_str, initial_conditions_list, method='general', branch=0,
+                    include_latex=False):
+        """
+        Resuelve la misma ecuación para muchas condiciones iniciales en una pasada
+        La solución general se calcula una sola vez; las constantes C1, C2 se despejan
+        simbólicamente en función de (x0, y0, y'0) y se evalúan con NumPy para todas
+        las condiciones a la vez. Si el despeje simbólico no es posible y la solución
+        es lineal en las constantes, se resuelven los sistemas lineales en bloque.
+        Cada condición puede ser un dict {'x0', 'y0', 'yp0'} o una tupla (x0, y0[, yp0]).
+        """
+        method_label = 'Barrido de Condiciones Iniciales'
+        try:
+            general = self.solve_spec({'equation': equation_str, 'method': method})
+            if not general.get('success'):
+                return general
+            rhs = self._explicit_solution(general['solution'], branch)
+            constant_fn, names = self._sweep_constants(general['solution'], branch, rhs)
+            x0, y0, yp0 = self._sweep_arrays(initial_conditions_list, len(names))
+            values = constant_fn(x0, y0, yp0)
+            constants = {name: values[i] for i, name in enumerate(names)}
+            
+            solutions = []
+            for i in range(x0.size):
+                if not all(np.isfinite(constants[name][i]) for name in names):
+                    solutions.append({
+                        'success': False,
+                        'error': 'Las condiciones iniciales no determinan las constantes',
+                        'method': general['method']
+                    })
+                    continue
+                substitution = {sp.Symbol(name): sp.Float(float(constants[name][i])) for name in names}
+                solution = Eq(self.y(self.x), rhs.xreplace(substitution), evaluate=False)
+                solution_str = str(solution)
+                particular = {
+                    'success': True,
+                    'solution': solution_str,
+                    'solution_formatted': self.format_solution(solution_str),
+                    'method': general['method']
+                }
+                if include_latex:
+                    particular['solution_latex'] = self.get_latex_solution(solution)
+                solutions.append(particular)
+            
             return {
                 'success': True,
-                'solution': str(solution_eq),
-                'solution_formatted': self.format_solution(solution_eq),
-                'solution_latex': self.get_latex_solution(solution_eq),
-                'method': "Caso especial: y·y'' + (y')² = 0"
+                'method': method_label,
+                'general_solution': general['solution'],
+                'constants': constants,
+                'x0': x0,
+                'y0': y0,
+                'yp0': yp0,
+                'solutions': solutions
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'error_type': type(e).__name__,
+                'method': method_label
             }
+    
+    def _sweep_constants(self, solution, branch, rhs):
+        """Función vectorizada (x0, y0, y'0) -> valores de las constantes de integración"""
+        key = ('sweep', str(solution), branch)
+        cached = self._compiled.get(key)
+        if cached is not None:
+            return cached
+        
+        names = sorted(s.name for s in rhs.free_symbols if s != self.x)
+        if not names:
+            raise ValueError("La solución no tiene constantes de integración")
+        if len(names) > 2:
+            raise NotImplementedError("El barrido admite a lo sumo dos constantes (C1, C2)")
+        unknowns = [sp.Symbol(name) for name in names]
+        X0, Y0, YP0 = symbols('X0 Y0 YP0')
+        conditions = [rhs.subs(self.x, X0) - Y0, diff(rhs, self.x).subs(self.x, X0) - YP0][:len(names)]
+        
+        try:
+            symbolic = sp.solve(conditions, unknowns, dict=True)
+        except NotImplementedError:
+            symbolic = []
+        if symbolic and all(c in symbolic[0] for c in unknowns):
+            exprs = [symbolic[0][c] for c in unknowns]
+            f = sp.lambdify((X0, Y0, YP0), exprs, 'numpy')
+            
+            def constant_fn(x0, y0, yp0):
+                with np.errstate(all='ignore'):
+                    return [np.broadcast_to(np.asarray(v, dtype=float), x0.shape) for v in f(x0, y0, yp0)]
+        else:
+            # Sistema lineal A(x0) C = b(x0, y0, y'0) resuelto en bloque
+            try:
+                A, b = sp.linear_eq_to_matrix(conditions, unknowns)
+            except (sp.PolynomialError, ValueError):
+                raise NotImplementedError("No se pudieron despejar las constantes de integración")
+            n = len(unknowns)
+            fa = [[sp.lambdify((X0, Y0, YP0), A[i, j], 'numpy') for j in range(n)] for i in range(n)]
+            fb = [sp.lambdify((X0, Y0, YP0), b[i], 'numpy') for i in range(n)]
+            
+            def constant_fn(x0, y0, yp0):
+                mats = np.empty((x0.size, n, n))
+                rhs_values = np.empty((x0.size, n))
+                for i in range(n):
+                    for j in range(n):
+                        mats[:, i, j] = fa[i][j](x0, y0, yp0)
+                    rhs_values[:, i] = fb[i](x0, y0, yp0)
+                result = np.full((x0.size, n), np.nan)
+                invertible = np.abs(np.linalg.det(mats)) > 1e-12
+                if invertible.any():
+                    result[invertible] = np.linalg.solve(mats[invertible], rhs_values[invertible][..., None])[..., 0]
+                return [result[:, k] for k in range(n)]
+        
+        compiled = (constant_fn, names)
+        self._compiled.put(key, compiled)
+        return compiled
+    
+    def _sweep_arrays(self, initial_conditions_list, n_constants):
+        def value(v):
+            if v is None or (isinstance(v, str) and not v.strip()):
+                return np.nan
+            if isinstance(v, (int, float, np.number)):
+                return float(v)
+            return float(sp.sympify(v))
+        
+        rows = []
+        for ic in initial_conditions_list:
+            if isinstance(ic, dict):
+                rows.append((value(ic.get('x0')), value(ic.get('y0')), value(ic.get('yp0'))))
+            else:
+                ic = tuple(ic) + (None,) * (3 - len(ic))
+                rows.append(tuple(value(v) for v in ic[:3]))
+        data = np.array(rows, dtype=float).reshape(-1, 3)
+        required = ['x0', 'y0', 'yp0'][:n_constants + 1]
+        for k, name in enumerate(required):
+            if np.isnan(data[:, k]).any():
+                raise ValueError(f"Falta {name} en alguna de las condiciones iniciales")
+        return data[:, 0], data[:, 1], data[:, 2]
+    
+    def _first_order_system(self, eq):
+        """Convierte la EDO en un sistema de primer orden Y' = F(x, Y) evaluable con NumPy"""
+        expr = self._canonical(eq)
+        cached = self._compiled.get(('system', expr))
+        if cached is not None:
+            return cached
+        
+        y = self.y(self.x)
+        derivatives = expr.atoms(sp.Derivative)
+        order = max((d.derivative_count for d in derivatives), default=0)
+        if order == 0:
+            raise ValueError("La ecuación no contiene derivadas de y")
+        candidates = sp.solve(expr, sp.Derivative(y, (self.x, order)))
+        if not candidates:
+            raise NotImplementedError("No se pudo despejar la derivada de mayor orden")
+        
+        states = sp.symbols(f'Y0:{order}')
+        rhs = candidates[0]
+        for k in range(order - 1, 0, -1):
+            rhs = rhs.subs(sp.Derivative(y, (self.x, k)), states[k])
+        rhs = rhs.subs(y, states[0])
+        if rhs.has(self.y) or rhs.has(sp.Derivative):
+            raise NotImplementedError("La ecuación no se puede escribir como sistema de primer orden")
+        
+        f = sp.lambdify((self.x, states), rhs, 'numpy')
+        
+        def system(t, state):
+            return np.append(state[1:], f(t, state))
+        
+        compiled = (system, order)
+        self._compiled.put(('system', expr), compiled)
+        return compiled
+    
+    def _numeric_ics(self, initial_conditions, order):
+        """Valores numéricos (x0, [y0, y'0]) de las condiciones iniciales"""
+        if order > 2:
+            raise NotImplementedError("La integración numérica admite ecuaciones de orden 1 y 2")
+        if not isinstance(initial_conditions, dict) or initial_conditions.get('x0') is None:
+            raise ValueError("La solución numérica requiere condiciones iniciales (x0, y(x0), y'(x0))")
+        required = ['y0', 'yp0'][:order]
+        missing = [name for name in required if initial_conditions.get(name) is None]
+        if missing:
+            raise ValueError(f"Faltan condiciones iniciales para la solución numérica: {', '.join(missing)}")
+        x0 = float(sp.sympify(initial_conditions['x0']))
+        state0 = np.array([float(sp.sympify(initial_conditions[name])) for name in required])
+        return x0, state0
+    
+    def _wants_numeric_fallback(self, result):
+        return not result.get('success') and (
+            result.get('error') == 'timeout' or result.get('error_type') == 'NotImplementedError'
+        )
+    
+    def _numeric_fallback(self, equation_str, initial_conditions, result):
+        # Se integra en este proceso: tras un timeout el trabajador se acaba de
+        # sustituir y la integración (acotada en pasos) no debe esperar a que se
+        # caliente el de repuesto dentro del mismo tiempo máximo
+        numeric = ODESolver.solve_numeric.__wrapped__(self, equation_str, initial_conditions=initial_conditions)
+        if not numeric.get('success'):
+            result = dict(result)
+            result['numeric_error'] = numeric.get('error')
+            return result
+        numeric['method'] = result.get('method', numeric['method'])
+        numeric['fallback_reason'] = result.get('error')
+        return numeric
+    
+    def _solve_special_cases(self, eq):
+        """Intenta resolver casos especiales no cubiertos por SymPy"""
+        with span('special_cases'):
+            return self._cached(('special', self._canonical(eq)), lambda: self._run_special_cases(eq))
+
+    def _run_special_cases(self, eq):
+        expr = self._canonical(eq)
+        shape = None
+        for case, target, solution_eq in self._special_case_targets():
+            if shape is None:
+                shape = self._equation_shape(expr)
+            if not case.accepts(shape):
+                continue
+            if self._matches_target(shape, target):
+                return {
+                    'success': True,
+                    'solution': str(solution_eq),
+                    'solution_formatted': self.format_solution(solution_eq),
+                    'solution_latex': self.get_latex_solution(solution_eq),
+                    'method': case.label
+                }
         return None
+
+    def _special_case_targets(self):
+        """Objetivos (forma polinómica) y soluciones de los casos especiales, construidos una vez"""
+        if self._special_targets is None:
+            targets = []
+            for case in _SPECIAL_CASES:
+                target, solution_eq = getattr(self, case.name)()
+                targets.append((case, self._equation_shape(target), solution_eq))
+            self._special_targets = targets
+        return self._special_targets
+
+    def _equation_shape(self, expr):
+        """
+        Rasgos estructurales baratos de la ecuación (sin simplify): orden, funciones
+        desconocidas que aparecen y, si es polinómica en y, y', y'', su forma Poly
+        """
+        y = self.y(self.x)
+        functions = frozenset(f.func for f in expr.atoms(sp.core.function.AppliedUndef))
+        order = max((d.derivative_count for d in expr.atoms(sp.Derivative)), default=0)
+        gens = [y] + [sp.Derivative(y, (self.x, k)) for k in range(1, order + 1)]
+        try:
+            poly = sp.Poly(expr, *gens)
+        except sp.PolynomialError:
+            poly = None
+        if poly is not None and any(c.has(self.y) for c in poly.coeffs()):
+            poly = None
+        return EquationShape(
+            order=order,
+            functions=functions,
+            degree=poly.total_degree() if poly is not None else None,
+            poly=poly
+        )
+
+    def _matches_target(self, shape, target):
+        """La ecuación es k·objetivo con k ≠ 0 independiente de y (comparación polinómica)"""
+        poly, target_poly = shape.poly, target.poly
+        if poly is None or target_poly is None or poly.monoms() != target_poly.monoms():
+            return False
+        factor = sp.cancel(poly.LC() / target_poly.LC())
+        if factor == 0:
+            return False
+        return all(
+            sp.cancel(c - factor * t) == 0
+            for c, t in zip(poly.coeffs(), target_poly.coeffs())
+        )
+
+    @_special_case(order=2, degree=2, label="Caso especial: y·y'' + (y')² = 0")
+    def _case_y_times_ypp_plus_yp_sq(self):
+        """y·y'' + (y')² = (y·y')' = 0  =>  y² = C1·x + C2"""
+        y = self.y(self.x)
+        target = y * diff(y, self.x, 2) + diff(y, self.x)**2
+        return target, Eq(y**2, self.C1 * self.x + self.C2)
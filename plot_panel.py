@@ -0,0 +1,262 @@
+"""
+Panel de gráficas de la interfaz: campo de pendientes y curvas solución
+El campo de pendientes de y' = F(x, y) se evalúa sobre una malla NxN con una sola
+llamada a la función compilada con lambdify (ODESolver.compile_slope) y las curvas
+con la solución compilada (ODESolver.evaluate). El campo y las curvas son artistas
+animados: el resto de la figura (ejes, marcas, rejilla) se dibuja sin ellos y se
+guarda como fondo en cada dibujo completo, y los artistas se pintan encima con
+blitting. Al desplazar o hacer zoom los datos de la nueva vista se recalculan como
+mucho una vez cada REFRESH_INTERVAL_MS y se pintan sobre el último fondo guardado.
+Mientras se arrastra con la herramienta de desplazamiento la barra solo cambia los
+límites (PanBlitMixin): las marcas y la rejilla del fondo se actualizan con un único
+dibujo completo al soltar el botón. El zoom por rectángulo ya dibuja una sola vez.
+"""
+
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+from matplotlib.figure import Figure
+
+
+# Tamaño de la malla del campo de pendientes (NxN) y puntos por curva
+FIELD_SIZE = 21
+CURVE_POINTS = 400
+# Longitud de cada segmento del campo, en fracción del lado de los ejes
+SEGMENT_LENGTH = 0.6 / FIELD_SIZE
+# Intervalo mínimo (ms) entre recálculos del campo y las curvas al desplazar o hacer zoom
+REFRESH_INTERVAL_MS = 40
+# Valores de la primera constante para la familia de soluciones
+FAMILY_VALUES = (-2, -1, -0.5, 0.5, 1, 2)
+
+THEME_STYLES = {
+    'dark': {'figure': '#2b2b2b', 'axes': '#242424', 'text': '#dce4ee', 'grid': '#3a3a3a',
+             'field': '#7f8c8d', 'family': '#3b8ed0', 'particular': '#f39c12'},
+    'light': {'figure': '#ebebeb', 'axes': '#ffffff', 'text': '#1a1a1a', 'grid': '#d0d0d0',
+              'field': '#95a5a6', 'family': '#1f6aa5', 'particular': '#d35400'},
+}
+
+
+def _finite(values):
+    """Valores reales con NaN (enmascarados) donde la solución no es real o no es finita"""
+    values = np.asarray(values)
+    if np.iscomplexobj(values):
+        values = np.where(np.abs(values.imag) < 1e-9, values.real, np.nan)
+    return np.ma.masked_invalid(np.asarray(values, dtype=float))
+
+
+def _auto_ylim(curves, point):
+    # Solo la mitad central de cada curva: las que crecen rápido no aplastan el resto
+    values = [np.ma.compressed(c[len(c) // 4: 3 * len(c) // 4]) for c in curves]
+    values = np.concatenate(values) if values else np.array([])
+    if point is not None:
+        values = np.append(values, point[1])
+    if values.size == 0:
+        return -3.0, 3.0
+    low, high = np.percentile(values, [5, 95])
+    if high - low < 1e-6:
+        low, high = low - 1, high + 1
+    pad = 0.15 * (high - low)
+    return float(low - pad), float(high + pad)
+
+
+class SolutionPlot:
+    """Campo de pendientes y curvas solución sobre una figura, redibujados con blitting"""
+
+    def __init__(self, figure, canvas, theme='dark', field_size=FIELD_SIZE):
+        self.figure = figure
+        self.canvas = canvas
+        self.field_size = field_size
+        self.ax = figure.add_subplot(111)
+        self._slope = None
+        self._family = None
+        self._particular = None
+        self._field = None
+        self._family_lines = []
+        self._particular_line = None
+        self._artists = []
+        self._background = None
+        self._stale = True
+        self._refresh_pending = False
+        self._timer = canvas.new_timer(interval=REFRESH_INTERVAL_MS)
+        self._timer.single_shot = True
+        self._timer.add_callback(self.refresh)
+        self.set_theme(theme)
+        canvas.mpl_connect('draw_event', self._on_draw)
+        self.ax.callbacks.connect('xlim_changed', self._on_limits)
+        self.ax.callbacks.connect('ylim_changed', self._on_limits)
+
+    def set_theme(self, theme):
+        style = THEME_STYLES.get(theme, THEME_STYLES['dark'])
+        self.style = style
+        self.figure.patch.set_facecolor(style['figure'])
+        self.ax.set_facecolor(style['axes'])
+        self.ax.tick_params(colors=style['text'])
+        for spine in self.ax.spines.values():
+            spine.set_color(style['grid'])
+        self.ax.grid(True, color=style['grid'], linewidth=0.6)
+        self.ax.xaxis.label.set_color(style['text'])
+        self.ax.yaxis.label.set_color(style['text'])
+        self.ax.title.set_color(style['text'])
+
+    def show(self, slope=None, family=None, particular=None, point=None, xlim=None, title=''):
+        """
+        Dibuja una nueva ecuación
+        slope(X, Y) devuelve las pendientes en una malla, family(xs) una matriz con una
+        curva por fila y particular(xs) la curva de las condiciones iniciales.
+        point = (x0, y0) marca la condición inicial.
+        """
+        for artist in self._artists:
+            artist.remove()
+        self._artists = []
+        self._family_lines = []
+        self._field = self._particular_line = None
+        self._slope, self._family, self._particular = slope, family, particular
+        # El fondo guardado es de la ecuación anterior: no vale hasta el próximo dibujo completo
+        self._background = None
+        style = self.style
+
+        if xlim is None:
+            x0 = point[0] if point is not None else 0.0
+            xlim = (x0 - 3.0, x0 + 3.0)
+        xs = np.linspace(xlim[0], xlim[1], CURVE_POINTS)
+        family_curves, particular_curve = self._curves(xs)
+
+        if slope is not None:
+            grid = np.zeros((self.field_size, self.field_size))
+            self._field = self.ax.quiver(
+                grid, grid, grid, grid, angles='xy', scale_units='xy', scale=1, pivot='mid',
+                headwidth=0, headlength=0, headaxislength=0, width=0.002, color=style['field']
+            )
+            self._artists.append(self._field)
+        if family is not None:
+            for _ in family_curves:
+                (line,) = self.ax.plot([], [], color=style['family'], linewidth=1.2, alpha=0.8)
+                self._family_lines.append(line)
+            self._artists.extend(self._family_lines)
+        if particular is not None:
+            (self._particular_line,) = self.ax.plot([], [], color=style['particular'], linewidth=2.2)
+            self._artists.append(self._particular_line)
+        if point is not None:
+            (marker,) = self.ax.plot([point[0]], [point[1]], 'o', color=style['particular'], markersize=6)
+            self._artists.append(marker)
+        for artist in self._artists:
+            artist.set_animated(True)
+
+        curves = family_curves + ([particular_curve] if particular_curve is not None else [])
+        self.ax.set_xlim(*xlim)
+        self.ax.set_ylim(*_auto_ylim(curves, point))
+        self.ax.set_xlabel('x')
+        self.ax.set_ylabel('y')
+        self.ax.set_title(title, fontsize=10)
+        self._update_data()
+        self.canvas.draw_idle()
+
+    def _curves(self, xs):
+        """(curvas de la familia, curva particular) evaluadas en xs"""
+        family, particular = [], None
+        with np.errstate(all='ignore'):
+            if self._family is not None:
+                try:
+                    family = [_finite(row) for row in np.atleast_2d(self._family(xs))]
+                except (ValueError, TypeError, ZeroDivisionError):
+                    family = []
+            if self._particular is not None:
+                try:
+                    particular = _finite(np.broadcast_to(self._particular(xs), xs.shape))
+                except (ValueError, TypeError, ZeroDivisionError):
+                    particular = np.ma.masked_all(xs.shape)
+        return family, particular
+
+    def _update_data(self):
+        """Recalcula el campo y las curvas para los límites actuales de los ejes"""
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        if self._field is not None:
+            n = self.field_size
+            X, Y = np.meshgrid(np.linspace(x0, x1, n + 2)[1:-1], np.linspace(y0, y1, n + 2)[1:-1])
+            # Una sola evaluación vectorizada de F(x, y) para toda la malla
+            S = np.asarray(self._slope(X, Y), dtype=float)
+            # Segmentos de la misma longitud en pantalla con la pendiente de F
+            with np.errstate(all='ignore'):
+                step = SEGMENT_LENGTH / np.hypot(1 / (x1 - x0), S / (y1 - y0))
+                rise = S * step
+            self._field.set_offsets(np.column_stack([X.ravel(), Y.ravel()]))
+            self._field.set_UVC(np.ma.masked_invalid(step), np.ma.masked_invalid(rise))
+        xs = np.linspace(x0, x1, CURVE_POINTS)
+        family, particular = self._curves(xs)
+        # Fuera de la vista se enmascara: así no se unen las ramas a ambos lados de una asíntota
+        margin = y1 - y0
+        for line, ys in zip(self._family_lines, family):
+            line.set_data(xs, np.ma.masked_outside(ys, y0 - margin, y1 + margin))
+        if self._particular_line is not None:
+            self._particular_line.set_data(xs, np.ma.masked_outside(particular, y0 - margin, y1 + margin))
+        self._stale = False
+
+    def _draw_artists(self):
+        for artist in self._artists:
+            self.ax.draw_artist(artist)
+
+    def _on_limits(self, ax):
+        # Durante un desplazamiento llegan muchos cambios de límites: se agrupan
+        self._stale = True
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self._timer.start()
+
+    def _on_draw(self, event):
+        # La figura se acaba de dibujar sin los artistas animados: se guarda como fondo
+        # y se pintan encima con los datos que ya tienen (el recálculo va en refresh)
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def refresh(self):
+        """Recalcula el campo y las curvas si cambió la vista y los redibuja sobre el fondo guardado (blitting)"""
+        self._refresh_pending = False
+        if self._stale:
+            self._update_data()
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.figure.bbox)
+
+
+class PanBlitMixin:
+    """
+    Desplazamiento con blitting para una barra de navegación de matplotlib
+    NavigationToolbar2.drag_pan redibuja la figura entera en cada movimiento del
+    ratón; aquí solo se mueven los límites (SolutionPlot repinta los artistas con
+    blitting al recibir xlim_changed/ylim_changed) y release_pan hace el dibujo
+    completo al soltar.
+    """
+
+    def drag_pan(self, event):
+        if event.buttons != {self._pan_info.button}:
+            # Se soltó el botón fuera del lienzo: se termina el desplazamiento
+            self.release_pan(None)
+            return
+        for ax in self._pan_info.axes:
+            ax.drag_pan(self._pan_info.button, event.key, event.x, event.y)
+
+
+class NavigationToolbar(PanBlitMixin, NavigationToolbar2Tk):
+    """Barra de desplazamiento/zoom de Tk con desplazamiento por blitting"""
+
+
+class PlotPanel:
+    """Figura de matplotlib incrustada en un frame de Tk con barra de desplazamiento/zoom"""
+
+    def __init__(self, master, theme='dark', figsize=(7, 4.5), dpi=100):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.toolbar = NavigationToolbar(self.canvas, master, pack_toolbar=False)
+        self.toolbar.update()
+        self.toolbar.pack(side='bottom', fill='x')
+        self.canvas.get_tk_widget().pack(side='top', fill='both', expand=True)
+        self.plot = SolutionPlot(self.figure, self.canvas, theme=theme)
+
+    def show(self, **kwargs):
+        self.plot.show(**kwargs)
+
+    def set_theme(self, theme):
+        self.plot.set_theme(theme)
+        self.canvas.draw_idle()
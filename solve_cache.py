@@ -0,0 +1,232 @@
+"""
+Caché de soluciones para el solucionador de ecuaciones diferenciales
+LRU acotada en memoria con contadores de aciertos, fallos y expulsiones,
+y almacén persistente en SQLite compartido entre procesos
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+# Incrementar cuando cambie el formato de las entradas guardadas o la forma en
+# que se obtienen las soluciones (p. ej. el hint de SymPy usado por cada método)
+SCHEMA_VERSION = 4
+
+
+class LRUCache:
+    """Caché LRU acotada y segura entre hilos"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self):
+        """Devuelve los contadores de la caché"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
+
+
+def _is_sympy(obj):
+    # SymPy se importa solo cuando hace falta: si no está cargado, obj no puede ser una expresión
+    sympy = sys.modules.get('sympy')
+    return sympy is not None and isinstance(obj, sympy.Basic)
+
+
+def canonical_repr(obj):
+    """Representación textual estable de una clave de caché (usa srepr para SymPy)"""
+    if _is_sympy(obj):
+        return sys.modules['sympy'].srepr(obj)
+    if isinstance(obj, (tuple, list)):
+        return '(' + ','.join(canonical_repr(item) for item in obj) + ')'
+    if isinstance(obj, frozenset):
+        return '{' + ','.join(sorted(canonical_repr(item) for item in obj)) + '}'
+    return repr(obj)
+
+
+def key_digest(key):
+    """Hash canónico (sha256) de una clave de caché"""
+    return hashlib.sha256(canonical_repr(key).encode('utf-8')).hexdigest()
+
+
+def _encode(value):
+    # Las funciones indefinidas de SymPy (y(x)) no siempre se pueden serializar
+    # con pickle, así que las expresiones se guardan como srepr
+    if _is_sympy(value):
+        return ('__srepr__', sys.modules['sympy'].srepr(value))
+    if isinstance(value, tuple):
+        return tuple(_encode(item) for item in value)
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, tuple):
+        if len(value) == 2 and value[0] == '__srepr__':
+            import sympy as sp
+            return sp.sympify(value[1])
+        return tuple(_decode(item) for item in value)
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+class SolutionStore:
+    """
+    Almacén persistente de soluciones en SQLite
+    Las entradas se versionan con la versión de SymPy y del esquema, de modo que
+    varios procesos del mismo equipo pueden compartir resultados sin mezclar
+    soluciones calculadas con versiones distintas.
+    """
+
+    def __init__(self, path, version=None):
+        import sympy as sp
+
+        self.path = os.fspath(path)
+        self.version = version or f"sympy-{sp.__version__}/schema-{SCHEMA_VERSION}"
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _connection(self):
+        # Una conexión heredada por fork no es segura: se reabre en cada proceso
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS solutions ('
+                'key TEXT NOT NULL, version TEXT NOT NULL, payload BLOB NOT NULL, '
+                'created REAL NOT NULL, PRIMARY KEY (key, version))'
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, digest, default=None):
+        from sympy import SympifyError
+
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    'SELECT payload FROM solutions WHERE key = ? AND version = ?',
+                    (digest, self.version)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            value = _decode(pickle.loads(row[0]))
+        except (sqlite3.Error, pickle.UnpicklingError, SympifyError, AttributeError, EOFError, ImportError):
+            self.errors += 1
+            return default
+        self.hits += 1
+        return value
+
+    def put(self, digest, value):
+        try:
+            payload = pickle.dumps(_encode(value), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self.errors += 1
+            return
+        try:
+            with self._lock:
+                self._connection().execute(
+                    'INSERT OR REPLACE INTO solutions (key, version, payload, created) VALUES (?, ?, ?, ?)',
+                    (digest, self.version, payload, time.time())
+                )
+        except sqlite3.Error:
+            self.errors += 1
+
+    def purge_stale(self):
+        """Elimina las entradas guardadas con otra versión de SymPy o del esquema"""
+        with self._lock:
+            cursor = self._connection().execute('DELETE FROM solutions WHERE version != ?', (self.version,))
+        return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._connection().execute('DELETE FROM solutions')
+
+    def __len__(self):
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT COUNT(*) FROM solutions WHERE version = ?', (self.version,)
+            ).fetchone()
+        return row[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def info(self):
+        """Devuelve los contadores del almacén"""
+        return {
+            'path': self.path,
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors
+        }
@@ -0,0 +1,354 @@
+"""
+Servicio HTTP/JSON local del solucionador de ecuaciones diferenciales
+Un servidor asyncio (solo biblioteca estándar) que expone los métodos solve_*
+de ODESolver. Las resoluciones se ejecutan en un pool de procesos precalentados
+(cada uno con su ODESolver ya construido y un primer dsolve hecho), con una cola
+acotada que rechaza peticiones (503) cuando está llena, una caché de resultados
+compartida por todos los clientes y el almacén SQLite compartido por los procesos.
+
+Uso:
+    python solve_server.py --port 8765 --workers 4 --store cache/soluciones.sqlite3
+
+    POST /solve            {"equation": "dy/dx = x*y", "method": "linear", "initial_conditions": {...}}
+    POST /solve/<método>   el método se toma de la ruta (exact: {"M": ..., "N": ...})
+    GET  /methods          métodos disponibles
+    GET  /health           estado del pool y de la cola
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from solve_cache import LRUCache
+
+
+MAX_BODY = 1 << 20
+MAX_HEADER_LINES = 100
+# Ecuaciones resueltas al arrancar cada proceso (cargan la maquinaria de dsolve)
+WARMUP_SPECS = (
+    {'equation': "dy/dx = x*y", 'method': 'general'},
+    {'equation': "y'' + y = x", 'method': 'second_order_const'},
+)
+
+_REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'
+}
+
+# Solver propio de cada proceso del pool
+_server_solver = None
+
+
+def _init_server_worker(solver_kwargs, warmup, ready):
+    global _server_solver
+    from ode_solver import ODESolver
+
+    _server_solver = ODESolver(**solver_kwargs)
+    for spec in warmup:
+        _server_solver.solve_spec(spec)
+    # El calentamiento no cuenta como acierto de caché de los clientes
+    _server_solver.clear_cache()
+    ready.release()
+
+
+def _solve_in_worker(spec):
+    return _server_solver.solve_spec(spec)
+
+
+def _ping():
+    return os.getpid()
+
+
+def _json_default(value):
+    # Resultados numéricos (arrays y escalares de NumPy)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class SolveServer:
+    """Servidor HTTP/JSON con pool de procesos precalentados y cola acotada"""
+
+    def __init__(self, host='127.0.0.1', port=8765, workers=None, queue_size=64, cache_size=1024,
+                 store=None, timeout=None, warmup=WARMUP_SPECS):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        # Peticiones admitidas a la vez (en cola + en ejecución) antes de responder 503
+        self.queue_size = queue_size
+        self.solver_kwargs = {'cache_size': 256, 'store': store, 'timeout': timeout}
+        self.warmup = tuple(warmup)
+        # Resultados ya calculados, compartidos por todos los clientes
+        self._results = LRUCache(cache_size)
+        # Peticiones idénticas en curso: se resuelven una vez y se comparte el futuro
+        self._inflight = {}
+        self._pending = 0
+        self._executor = None
+        self._ready = None
+        self._server = None
+        self.stats = {'requests': 0, 'solved': 0, 'rejected': 0, 'coalesced': 0, 'errors': 0}
+
+    # -- pool de procesos ---------------------------------------------------
+
+    def _new_executor(self):
+        # Cada proceso libera el semáforo al terminar su calentamiento
+        self._ready = mp.Semaphore(0)
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_server_worker,
+            initargs=(self.solver_kwargs, self.warmup, self._ready)
+        )
+
+    async def warm_up(self):
+        """Arranca todos los procesos del pool y espera a que terminen el calentamiento"""
+        loop = asyncio.get_running_loop()
+        executor, ready = self._executor, self._ready
+        # Una tarea por proceso: el pool crea un proceso nuevo por cada envío sin procesos libres
+        pings = [loop.run_in_executor(executor, _ping) for _ in range(self.workers)]
+        for _ in range(self.workers):
+            await loop.run_in_executor(None, ready.acquire)
+        return sorted(set(await asyncio.gather(*pings)))
+
+    async def _replace_executor(self, broken):
+        """Sustituye el pool roto por uno nuevo ya precalentado"""
+        # Todas las peticiones en curso fallan con el mismo pool: solo la primera lo
+        # sustituye, las demás encuentran ya el nuevo (o uno que se está calentando)
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+        try:
+            await self.warm_up()
+        except BrokenProcessPool:
+            # El nuevo pool también se rompió: lo sustituirá la siguiente petición
+            pass
+
+    async def start(self):
+        start = time.perf_counter()
+        # SymPy se importa antes de crear el pool (fuera del bucle de eventos): los
+        # procesos hijos lo heredan al hacer fork y el primer /solve no bloquea el bucle
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, importlib.import_module, 'ode_solver')
+        self._executor = self._new_executor()
+        await self.warm_up()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Servidor en http://{self.host}:{self.port} ({self.workers} procesos precalentados "
+              f"en {time.perf_counter() - start:.1f} s)", file=sys.stderr)
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # -- resolución -----------------------------------------------------------
+
+    def _normalize(self, spec, method):
+        from ode_solver import SOLVE_METHODS
+
+        if not isinstance(spec, dict):
+            raise HTTPError(400, 'El cuerpo debe ser un objeto JSON')
+        spec = dict(spec)
+        spec['method'] = method or spec.get('method') or 'general'
+        if spec['method'] not in SOLVE_METHODS:
+            raise HTTPError(404, f"Método desconocido: {spec['method']}")
+        for field in ('equation', 'M', 'N'):
+            if isinstance(spec.get(field), str):
+                spec[field] = spec[field].strip()
+        return spec
+
+    async def solve(self, spec):
+        """Resuelve spec en el pool (o la devuelve de la caché compartida)"""
+        key = json.dumps(spec, sort_keys=True, default=str)
+        cached = self._results.get(key)
+        if cached is not None:
+            return dict(cached, cached=True)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats['coalesced'] += 1
+            return dict(await asyncio.shield(inflight))
+        if self._pending >= self.queue_size:
+            self.stats['rejected'] += 1
+            raise HTTPError(503, f'Cola llena ({self.queue_size} peticiones pendientes)')
+
+        # La resolución es una tarea propia: si se cancela la petición que la inició
+        # (el cliente se desconecta), las idénticas que esperan el resultado lo reciben
+        task = asyncio.ensure_future(self._solve_shared(key, spec))
+        # Evita el aviso de excepción no recuperada si nadie llega a esperarla
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[key] = task
+        self._pending += 1
+        return dict(await asyncio.shield(task))
+
+    async def _solve_shared(self, key, spec):
+        loop = asyncio.get_running_loop()
+        try:
+            executor = self._executor
+            try:
+                result = await loop.run_in_executor(executor, _solve_in_worker, spec)
+            except BrokenProcessPool:
+                # Un proceso murió (p. ej. por memoria): se recrea el pool
+                await self._replace_executor(executor)
+                result = {'success': False, 'error': 'El proceso de resolución terminó inesperadamente',
+                          'method': spec['method']}
+            if result.get('success'):
+                self._results.put(key, result)
+            self.stats['solved'] += 1
+            return result
+        finally:
+            self._pending -= 1
+            del self._inflight[key]
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'workers': self.workers,
+            'pending': self._pending,
+            'queue_size': self.queue_size,
+            'cache': self._results.info(),
+            'stats': dict(self.stats)
+        }
+
+    # -- HTTP -----------------------------------------------------------------
+
+    async def _route(self, verb, path, body):
+        from ode_solver import SOLVE_METHODS
+
+        path = path.split('?', 1)[0].rstrip('/') or '/'
+        if path == '/health':
+            if verb != 'GET':
+                raise HTTPError(405, 'Use GET')
+            return self.health()
+        if path == '/methods':
+            if verb != 'GET':
+                raise HTTPError(405, 'Use GET')
+            return {'methods': sorted(SOLVE_METHODS)}
+        if path == '/solve' or path.startswith('/solve/'):
+            if verb != 'POST':
+                raise HTTPError(405, 'Use POST')
+            method = path[len('/solve/'):] if path.startswith('/solve/') else None
+            try:
+                spec = json.loads(body or b'{}')
+            except (ValueError, UnicodeDecodeError) as e:
+                raise HTTPError(400, f'JSON no válido: {e}')
+            return await self.solve(self._normalize(spec, method))
+        raise HTTPError(404, f'Ruta desconocida: {path}')
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            verb, path, version = line.decode('latin-1').split()
+        except ValueError:
+            raise HTTPError(400, 'Línea de petición no válida')
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            header = await reader.readline()
+            if header in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = header.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(400, 'Demasiadas cabeceras')
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, 'Content-Length no válido')
+        if length > MAX_BODY:
+            raise HTTPError(413, f'El cuerpo supera {MAX_BODY} bytes')
+        body = await reader.readexactly(length) if length else b''
+        keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+        return verb.upper(), path, body, keep_alive
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode('utf-8')
+        head = [
+            f'HTTP/1.1 {status} {_REASONS.get(status, "")}',
+            'Content-Type: application/json; charset=utf-8',
+            f'Content-Length: {len(body)}',
+            f'Connection: {"keep-alive" if keep_alive else "close"}'
+        ]
+        if status == 503:
+            head.append('Retry-After: 1')
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    verb, path, body, keep_alive = request
+                    self.stats['requests'] += 1
+                    status, payload = 200, await self._route(verb, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'success': False, 'error': e.message}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    status, payload = 500, {'success': False, 'error': str(e), 'error_type': type(e).__name__}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del solucionador de EDOs")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None, help="Procesos del pool (por defecto, uno por núcleo)")
+    parser.add_argument('--queue-size', type=int, default=64, help="Peticiones pendientes antes de responder 503")
+    parser.add_argument('--cache-size', type=int, default=1024, help="Resultados en la caché compartida")
+    parser.add_argument('--store', default=None, help="Almacén SQLite compartido por los procesos")
+    parser.add_argument('--timeout', type=float, default=None, help="Tiempo máximo (s) por resolución")
+    args = parser.parse_args(argv)
+
+    server = SolveServer(host=args.host, port=args.port, workers=args.workers, queue_size=args.queue_size,
+                         cache_size=args.cache_size, store=args.store, timeout=args.timeout)
+
+    async def run():
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
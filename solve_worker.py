@@ -0,0 +1,186 @@
+"""
+Proceso trabajador para resolver ecuaciones con límite de tiempo
+Cada llamada se ejecuta en un subproceso persistente con su propio ODESolver.
+Si se agota el tiempo o se cancela, el subproceso se termina (y con él sus
+cachés y la maquinaria de dsolve ya cargada): no hay forma segura de
+interrumpir SymPy a mitad de un cálculo. Para que la siguiente llamada no
+empiece en frío, en ese momento se arranca un subproceso de repuesto que se
+precalienta con WARMUP_CALLS mientras el llamante atiende el timeout.
+"""
+
+import multiprocessing as mp
+import threading
+
+
+# Llamadas con las que se precalienta el subproceso de repuesto
+WARMUP_CALLS = (
+    ('solve_spec', ({'equation': "dy/dx = x*y", 'method': 'general'},)),
+)
+
+
+class SolveTimeout(Exception):
+    """La resolución superó el tiempo máximo permitido"""
+
+
+class SolveCancelled(Exception):
+    """La resolución fue cancelada"""
+
+
+class WorkerCrashed(Exception):
+    """El subproceso terminó sin devolver un resultado"""
+
+
+def _worker_main(conn, solver_kwargs, warmup):
+    import instrumentation
+    from ode_solver import ODESolver
+
+    solver = ODESolver(**solver_kwargs)
+    for name, args in warmup:
+        try:
+            getattr(solver, name)(*args)
+        except Exception:
+            pass
+    # El calentamiento no deja soluciones en caché ni trazas
+    solver.clear_cache()
+    instrumentation.reset()
+    while True:
+        try:
+            name, args, kwargs = conn.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            result = ('ok', getattr(solver, name)(*args, **kwargs))
+        except Exception as e:
+            result = ('error', f'{type(e).__name__}: {e}')
+        try:
+            conn.send(result)
+        except (BrokenPipeError, OSError):
+            break
+
+
+class SolveWorker:
+    """
+    Subproceso reutilizable que ejecuta métodos de ODESolver con límite de tiempo
+    Con respawn=True (por defecto), tras un timeout o una cancelación se arranca
+    en el acto un subproceso de repuesto precalentado; con respawn=False se crea
+    en frío en la siguiente llamada. Cada llamada tiene su identificador (job),
+    de modo que cancel() solo afecta a la llamada a la que va dirigida.
+    """
+
+    def __init__(self, respawn=True, **solver_kwargs):
+        self.respawn = respawn
+        self.solver_kwargs = solver_kwargs
+        self._lock = threading.Lock()
+        # Protege el estado de las llamadas frente a cancel() desde otros hilos
+        self._state = threading.Lock()
+        self._process = None
+        self._conn = None
+        self._last_job = 0
+        self._pending = set()
+        self._running = None
+        self._cancelled = set()
+
+    def _start(self, warmup=()):
+        parent_conn, child_conn = mp.Pipe()
+        process = mp.Process(target=_worker_main, args=(child_conn, self.solver_kwargs, warmup), daemon=True)
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+
+    def _kill(self):
+        process, conn = self._process, self._conn
+        self._process = None
+        self._conn = None
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(1)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        if conn is not None:
+            conn.close()
+
+    def _replace(self):
+        # El subproceso terminado se sustituye ya por uno que se calienta en segundo plano
+        self._kill()
+        if self.respawn:
+            self._start(WARMUP_CALLS)
+
+    def new_job(self):
+        """Reserva el identificador de una llamada futura (se puede cancelar antes de que empiece)"""
+        with self._state:
+            self._last_job += 1
+            self._pending.add(self._last_job)
+            return self._last_job
+
+    def call(self, name, args=(), kwargs=None, timeout=None, job=None):
+        """
+        Ejecuta solver.<name>(*args, **kwargs) en el subproceso
+        Lanza SolveTimeout si no termina en timeout segundos y SolveCancelled
+        si se canceló la llamada (antes de empezar o mientras tanto). En ambos
+        casos el subproceso se termina y se pierden sus cachés; la siguiente
+        llamada usa el de repuesto (y espera, dentro de su timeout, a que acabe
+        de calentarse). job es un identificador de new_job(); si no se indica
+        se reserva uno.
+        """
+        if job is None:
+            job = self.new_job()
+        with self._lock:
+            with self._state:
+                self._pending.discard(job)
+                if job in self._cancelled:
+                    self._cancelled.discard(job)
+                    raise SolveCancelled()
+                if self._process is None or not self._process.is_alive():
+                    self._start()
+                self._running = job
+            conn = self._conn
+            try:
+                conn.send((name, args, kwargs or {}))
+                ready = conn.poll(timeout)
+            except (EOFError, OSError):
+                ready = None
+            # El resultado se recibe y la llamada deja de estar en curso de forma atómica
+            # respecto a cancel(): una cancelación posterior ya no la afecta
+            with self._state:
+                if ready:
+                    try:
+                        status, value = conn.recv()
+                    except (EOFError, OSError):
+                        ready = None
+                self._running = None
+                cancelled = job in self._cancelled
+                self._cancelled.discard(job)
+            if cancelled:
+                self._replace()
+                raise SolveCancelled()
+            if ready is None:
+                self._replace()
+                raise WorkerCrashed()
+            if not ready:
+                self._replace()
+                raise SolveTimeout()
+            if status == 'error':
+                raise RuntimeError(value)
+            return value
+
+    def cancel(self, job=None):
+        """
+        Cancela la llamada job (por defecto, la que está en curso) terminando el
+        subproceso si ya se está ejecutando. Una llamada que ya terminó no se
+        ve afectada. Devuelve True si había algo que cancelar.
+        """
+        with self._state:
+            job = self._running if job is None else job
+            if job is None or (job != self._running and job not in self._pending):
+                return False
+            self._cancelled.add(job)
+            process = self._process
+            if job == self._running and process is not None and process.is_alive():
+                process.terminate()
+            return True
+
+    def close(self):
+        with self._lock:
+            self._kill()
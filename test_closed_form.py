@@ -0,0 +1,87 @@
+"""Pruebas de regresión de los motores directos de closed_form"""
+
+import pytest
+import sympy as sp
+
+import closed_form
+
+
+x = sp.symbols('x')
+y = sp.Function('y')(x)
+
+
+def _residual(eq, solution, point):
+    """Residuo de la ecuación con la solución sustituida, evaluado en x = point"""
+    rhs = solution.rhs
+    expr = (eq.lhs - eq.rhs).subs(y.diff(x), rhs.diff(x)).subs(y, rhs)
+    return complex(expr.subs(x, point).evalf())
+
+
+def _solve_bernoulli(eq, y0=None):
+    ics = {y.subs(x, 0): y0} if y0 is not None else None
+    return closed_form.solve_bernoulli(eq, x, y, ics)
+
+
+@pytest.mark.parametrize('equation, y0', [
+    (sp.Eq(y.diff(x) - y, y**3), -1),
+    (sp.Eq(y.diff(x) - y, y**3), sp.Rational(1, 2)),
+    (sp.Eq(y.diff(x) + y, y**4), -1),
+    (sp.Eq(y.diff(x) + y, x * y**2), -1),
+])
+def test_bernoulli_keeps_sign_of_y0(equation, y0):
+    result = _solve_bernoulli(equation, y0)
+    solution = result['solution']
+    assert isinstance(solution, sp.Eq)
+    assert complex(solution.rhs.subs(x, 0)) == pytest.approx(complex(y0))
+    assert abs(_residual(equation, solution, sp.Rational(1, 10))) < 1e-9
+
+
+def test_bernoulli_even_root_returns_both_branches():
+    equation = sp.Eq(y.diff(x) - y, y**3)
+    solutions = _solve_bernoulli(equation)['solution']
+    assert isinstance(solutions, list) and len(solutions) == 2
+    assert sp.simplify(solutions[0].rhs + solutions[1].rhs) == 0
+
+
+def test_bernoulli_ics_not_mappable_to_v_fall_back():
+    # y = v^2 no puede tomar y0 < 0: el motor cede a dsolve
+    equation = sp.Eq(y.diff(x) + y, sp.sqrt(y))
+    assert _solve_bernoulli(equation, -4) is None
+
+
+def test_homogeneous_only_accepts_a_single_y0():
+    equation = sp.Eq(y.diff(x), (x**2 + y**2) / (x * y))
+    ics = {y.subs(x, 1): 2, y.diff(x).subs(x, 1): sp.Rational(5, 2)}
+    assert closed_form.solve_homogeneous(equation, x, y, ics) is None
+    assert closed_form.solve_homogeneous(equation, x, y, {y.subs(x, 0): 2}) is None
+    solution = closed_form.solve_homogeneous(equation, x, y, {y.subs(x, 1): 2})['solution']
+    assert solution.rhs.subs(x, 1) == 2
+
+
+@pytest.mark.parametrize('equation', [
+    sp.Eq(y.diff(x) + y, x),
+    sp.Eq(y.diff(x) + 2*x*y, x),
+    sp.Eq(y.diff(x) + y/x, sp.sin(x)),
+    sp.Eq(y.diff(x) - y, sp.exp(2*x)),
+    sp.Eq(y.diff(x) + y, sp.exp(-x)),
+])
+def test_linear_matches_dsolve_form(equation):
+    solution = closed_form.solve_first_order_linear(equation, x, y)['solution']
+    expected = sp.dsolve(equation, y)
+    assert sp.simplify(solution.rhs - expected.rhs) == 0
+    assert sp.count_ops(solution.rhs) <= sp.count_ops(expected.rhs)
+
+
+C1 = sp.Symbol('C1')
+
+
+@pytest.mark.parametrize('equation, constant', [
+    (sp.Eq(y.diff(x) + y, x * y**2), C1),
+    (sp.Eq(y.diff(x) + y/x, x**2 * y**2), 2*C1),
+    (sp.Eq(y.diff(x), y + x*sp.sqrt(y)), C1),
+])
+def test_bernoulli_matches_dsolve_up_to_constant(equation, constant):
+    # constant es el valor de la C1 de dsolve que corresponde a la C1 del motor
+    solution = closed_form.solve_bernoulli(equation, x, y)['solution']
+    expected = sp.dsolve(equation, y)
+    assert sp.simplify(solution.rhs - expected.rhs.subs(C1, constant)) == 0
@@ -0,0 +1,66 @@
+"""Pruebas del analizador de ecuaciones: multiplicación implícita y aplicación de funciones"""
+
+import pytest
+import sympy as sp
+
+import equation_parser
+from ode_solver import ODESolver
+
+
+x = sp.Symbol('x')
+y = sp.Function('y')
+Y = y(x)
+NAMES = {'x': x, 'y': y, 'e': sp.E, 'E': sp.E, 'exp': sp.exp}
+
+
+def parse(text):
+    return equation_parser.parse(text, x, y, NAMES)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("xy^2", x * Y**2),
+    ("xy**2", x * Y**2),
+    ("2xy^2", 2 * x * Y**2),
+    ("-xy^2", -x * Y**2),
+    ("xe^x", x * sp.exp(x)),
+    ("xe^(2x)", x * sp.exp(2 * x)),
+    ("ysin(x)", Y * sp.sin(x)),
+    ("ycos(x)", Y * sp.cos(x)),
+    ("yexp(x)", Y * sp.exp(x)),
+    ("xy", x * Y),
+    ("x(x+1)", x * (x + 1)),
+    ("2sin(x)", 2 * sp.sin(x)),
+])
+def test_implicit_multiplication(text, expected):
+    assert parse(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("xy'", x * Y.diff(x)),
+    ("yy''", Y * Y.diff(x, 2)),
+    ("xy'^2", x * Y.diff(x)**2),
+])
+def test_product_ending_in_derivative(text, expected):
+    assert parse(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("sin x", sp.sin(x)),
+    ("exp 2x", sp.exp(2 * x)),
+    ("sin x + 1", sp.sin(x) + 1),
+    ("sin 2x^2", sp.sin(2 * x**2)),
+])
+def test_function_without_parentheses(text, expected):
+    assert parse(text) == expected
+
+
+def test_bernoulli_with_implicit_power():
+    result = ODESolver().solve_bernoulli("y' + y = xy^2")
+    assert result['success']
+    assert sp.sympify(result['Q']) == x
+    assert result['n'] == '2'
+
+
+def test_unknown_derivative_is_rejected():
+    with pytest.raises(equation_parser.ParseError):
+        parse("z' = x")
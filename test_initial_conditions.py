@@ -0,0 +1,32 @@
+"""Pruebas de las condiciones iniciales: los valores nulos son condiciones válidas"""
+
+import pytest
+import sympy as sp
+
+from ode_solver import ODESolver
+
+
+def test_zero_initial_value_is_applied():
+    solver = ODESolver()
+    result = solver.solve_linear("dy/dx + y = x", {'x0': 0, 'y0': 0})
+    x = solver.x
+    solution = sp.sympify(result['solution'], locals=solver.parse_locals)
+    assert sp.simplify(solution.rhs - (x - 1 + sp.exp(-x))) == 0
+
+
+def test_zero_values_for_second_order():
+    solver = ODESolver()
+    result = solver.solve_general("y'' + y = 0", {'x0': 0, 'y0': 0, 'yp0': 1})
+    solution = sp.sympify(result['solution'], locals=solver.parse_locals)
+    assert sp.simplify(solution.rhs - sp.sin(solver.x)) == 0
+
+
+def test_blank_values_are_missing():
+    solver = ODESolver()
+    assert solver._prepare_ics({'x0': '0', 'y0': '', 'yp0': None}) is None
+    assert solver._prepare_ics({'x0': 0, 'y0': 0}) == {solver.y(0): 0}
+
+
+def test_zero_value_requires_x0():
+    with pytest.raises(ValueError):
+        ODESolver()._prepare_ics({'y0': 0})
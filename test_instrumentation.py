@@ -0,0 +1,54 @@
+"""Pruebas de la instrumentación: duraciones por fase, hint elegido y listeners"""
+
+from instrumentation import current_trace, record, span, tracing
+from ode_solver import ODESolver
+
+
+def test_span_accumulates_and_nested_tracing_reuses_outer_trace():
+    with tracing() as (trace, owner):
+        assert owner
+        with span('fase'):
+            pass
+        with tracing() as (inner, inner_owner):
+            assert inner is trace and not inner_owner
+            with span('fase'):
+                pass
+            record('hint', 'separable')
+    assert current_trace() is None
+    assert list(trace.timings) == ['fase']
+    assert trace.info == {'hint': 'separable'}
+
+
+def test_span_without_trace_does_nothing():
+    with span('fase'):
+        record('hint', 'separable')
+    assert current_trace() is None
+
+
+def test_result_timings_cover_solver_phases():
+    result = ODESolver().solve_separable("y' = x*y")
+    timings = result['timings']
+    for phase in ('parse', 'classify', 'dsolve', 'format', 'latex', 'total'):
+        assert phase in timings
+    assert timings['total'] >= timings['dsolve']
+    assert result['hint'] == 'separable'
+
+
+def test_cached_result_keeps_hint():
+    solver = ODESolver()
+    first = solver.solve_general("y'' + y = 0")
+    second = solver.solve_general("y'' + y = 0")
+    assert second['hint'] == first['hint'] == 'nth_linear_constant_coeff_homogeneous'
+
+
+def test_listeners_receive_every_phase():
+    solver = ODESolver()
+    seen = []
+    solver.add_listener(lambda phase, seconds, result: seen.append(phase))
+    result = solver.solve_linear("dy/dx + y = x")
+    assert sorted(seen) == sorted(result['timings'])
+
+
+def test_profile_is_attached():
+    result = ODESolver(profile='cprofile').solve_linear("dy/dx + y = x")
+    assert 'cumulative' in result['profile']
@@ -0,0 +1,55 @@
+"""Pruebas del integrador numérico y de la resolución numérica de respaldo"""
+
+import numpy as np
+import pytest
+
+from numeric_solver import IntegrationError, integrate_ivp
+from ode_solver import ODESolver
+
+
+SLOW = "y'' = sin(y)*exp(y') + x**3*y'**2"
+
+
+@pytest.mark.parametrize('method', ['RK45', 'Radau'])
+def test_integrate_ivp_matches_exponential(method):
+    ts = np.linspace(0.1, 2, 20)
+    data = integrate_ivp(lambda t, y: -y, 0.0, np.array([1.0]), ts, method=method)
+    assert np.allclose(data['y'][:, 0], np.exp(-ts), rtol=1e-4, atol=1e-6)
+    assert data['steps'] > 0
+
+
+def test_integrate_ivp_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        integrate_ivp(lambda t, y: y, 0.0, np.array([1.0]), [1.0], method='Euler')
+
+
+def test_integrate_ivp_reports_step_limit():
+    with pytest.raises(IntegrationError):
+        integrate_ivp(lambda t, y: -y, 0.0, np.array([1.0]), [100.0], max_steps=2)
+
+
+def test_solve_numeric_second_order_matches_cosine():
+    result = ODESolver().solve_numeric("y'' + y = 0", {'x0': 0, 'y0': 1, 'yp0': 0}, x_end=3)
+    assert result['success']
+    assert np.allclose(result['y'], np.cos(result['x']), atol=1e-5)
+    assert np.allclose(result['yp'], -np.sin(result['x']), atol=1e-5)
+
+
+def test_numeric_fallback_on_timeout():
+    solver = ODESolver(timeout=0.5, numeric_fallback=True)
+    try:
+        result = solver.solve_general(SLOW, {'x0': 0, 'y0': 0, 'yp0': 0})
+    finally:
+        solver.close()
+    assert result['success'] and result['numeric']
+    assert result['fallback_reason'] == 'timeout'
+
+
+def test_no_numeric_fallback_by_default():
+    solver = ODESolver(timeout=0.5)
+    try:
+        result = solver.solve_general(SLOW, {'x0': 0, 'y0': 0, 'yp0': 0})
+    finally:
+        solver.close()
+    assert not result['success']
+    assert result['error'] == 'timeout'
@@ -0,0 +1,47 @@
+"""Pruebas del panel de gráficas: desplazamiento con blitting (sin pantalla, backend Agg)"""
+
+import numpy as np
+from matplotlib.backend_bases import MouseButton, MouseEvent, NavigationToolbar2
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from plot_panel import PanBlitMixin, SolutionPlot
+
+
+class _Toolbar(PanBlitMixin, NavigationToolbar2):
+    pass
+
+
+def _scripted_drag(toolbar_class, moves=20):
+    figure = Figure(figsize=(7, 4.5), dpi=100)
+    canvas = FigureCanvasAgg(figure)
+    plot = SolutionPlot(figure, canvas)
+    plot.show(slope=lambda X, Y: X * Y, particular=np.exp, point=(0, 1))
+    canvas.draw()
+    toolbar = toolbar_class(canvas)
+    toolbar.pan()
+
+    draws, blits = [], []
+    draw, blit = canvas.draw, canvas.blit
+    canvas.draw = lambda *args: (draws.append(1), draw(*args))
+    canvas.blit = lambda *args: (blits.append(1), blit(*args))
+
+    (x0, y0), (x1, y1) = figure.axes[0].bbox.get_points()
+    x, y = (x0 + x1) / 2, (y0 + y1) / 2
+    MouseEvent('button_press_event', canvas, x, y, button=MouseButton.LEFT)._process()
+    for step in range(1, moves + 1):
+        MouseEvent('motion_notify_event', canvas, x + 5 * step, y, buttons={MouseButton.LEFT})._process()
+        # El temporizador de Agg no se dispara solo: se simula cada refresco
+        plot.refresh()
+    MouseEvent('button_release_event', canvas, x + 5 * moves, y, button=MouseButton.LEFT)._process()
+    return len(draws), len(blits), plot.ax.get_xlim()
+
+
+def test_pan_blits_and_draws_once_on_release():
+    draws, blits, xlim = _scripted_drag(_Toolbar)
+    assert draws == 1
+    assert blits == 20
+    base_draws, _, base_xlim = _scripted_drag(NavigationToolbar2)
+    # Mismo desplazamiento que la barra estándar, que dibuja en cada movimiento
+    assert base_draws > 20
+    assert np.allclose(xlim, base_xlim)
@@ -0,0 +1,39 @@
+"""Pruebas de solve_batch: deduplicación de entradas y orden de los resultados"""
+
+from ode_solver import ODESolver
+
+
+BATCH = [
+    "dy/dx = x*y",
+    {'equation': "dy/dx + y = x", 'method': 'linear'},
+    "dy/dx = x*y",
+    {'method': 'linear', 'equation': "dy/dx + y = x"},
+    "y'' + y = 0",
+]
+
+
+def test_batch_solves_each_distinct_spec_once(monkeypatch):
+    solver = ODESolver()
+    calls = []
+    solve_spec = solver.solve_spec
+
+    def counting(spec, *args, **kwargs):
+        calls.append(spec['equation'])
+        return solve_spec(spec, *args, **kwargs)
+
+    monkeypatch.setattr(solver, 'solve_spec', counting)
+    results = solver.solve_batch(BATCH, workers=1)
+    assert calls == ["dy/dx = x*y", "dy/dx + y = x", "y'' + y = 0"]
+    assert len(results) == len(BATCH)
+    assert results[0]['solution'] == results[2]['solution']
+    assert results[1]['solution'] == results[3]['solution']
+
+
+def test_batch_results_follow_input_order():
+    solver = ODESolver()
+    expected = [solver.solve_spec(solver._normalize_spec(spec, 'general')) for spec in BATCH]
+    results = solver.solve_batch(BATCH, workers=2)
+    assert [r['solution'] for r in results] == [r['solution'] for r in expected]
+    # Los duplicados son copias independientes
+    results[0]['solution'] = None
+    assert results[2]['solution'] is not None
@@ -0,0 +1,81 @@
+"""Pruebas de la caché LRU de soluciones y del almacén persistente SQLite"""
+
+import sympy as sp
+
+from ode_solver import ODESolver
+from solve_cache import LRUCache, SolutionStore, key_digest
+
+
+def test_lru_counts_hits_and_misses():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    assert cache.get('b', 'missing') == 'missing'
+    info = cache.info()
+    assert (info['hits'], info['misses'], info['size']) == (1, 1, 1)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.info()['evictions'] == 1
+
+
+def test_lru_with_zero_size_stores_nothing():
+    cache = LRUCache(0)
+    cache.put('a', 1)
+    assert len(cache) == 0
+
+
+def test_solver_reuses_cached_solution():
+    solver = ODESolver()
+    first = solver.solve_linear("dy/dx + y = x")
+    hits = solver.cache_info()['hits']
+    second = solver.solve_linear("dy/dx + y = x")
+    assert second['solution'] == first['solution']
+    assert solver.cache_info()['hits'] > hits
+    solver.clear_cache()
+    assert solver.cache_info()['size'] == 0
+
+
+def test_store_round_trips_sympy_values(tmp_path):
+    x = sp.symbols('x')
+    y = sp.Function('y')
+    store = SolutionStore(tmp_path / 'store.sqlite3')
+    digest = key_digest(('dsolve', 'linear', x))
+    value = ('1st_linear', sp.Eq(y(x), sp.exp(-x)))
+    store.put(digest, value)
+    assert store.get(digest) == value
+    assert store.get(key_digest('otra'), 'missing') == 'missing'
+    assert store.info()['hits'] == 1
+    store.close()
+
+
+def test_store_ignores_and_purges_other_schema_versions(tmp_path):
+    path = tmp_path / 'store.sqlite3'
+    old = SolutionStore(path, version='sympy-0/schema-0')
+    old.put('clave', 'antigua')
+    old.close()
+    store = SolutionStore(path)
+    assert store.get('clave') is None
+    assert len(store) == 0
+    assert store.purge_stale() == 1
+    store.close()
+
+
+def test_solver_reads_solutions_from_store(tmp_path):
+    path = tmp_path / 'store.sqlite3'
+    first = ODESolver(store=path)
+    expected = first.solve_separable("y' = x*y")
+    first.close()
+    second = ODESolver(store=path)
+    result = second.solve_separable("y' = x*y")
+    assert result['solution'] == expected['solution']
+    assert result['hint'] == expected['hint']
+    assert second.cache_info()['store']['hits'] > 0
+    second.close()
@@ -0,0 +1,63 @@
+"""Pruebas del servicio HTTP: peticiones agrupadas y recuperación del pool de procesos"""
+
+import asyncio
+import os
+import signal
+
+from solve_server import SolveServer, _ping
+
+
+SPEC = {'equation': "y'' + y = x*exp(x)", 'method': 'general'}
+OTHER = {'equation': "y'' - y = x*sin(x)", 'method': 'general'}
+
+
+def run(coroutine_function):
+    async def main():
+        server = SolveServer(port=0, workers=1, warmup=())
+        await server.start()
+        try:
+            return await coroutine_function(server)
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_waiters_survive_cancelled_owner():
+    async def scenario(server):
+        owner = asyncio.ensure_future(server.solve(dict(SPEC)))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.ensure_future(server.solve(dict(SPEC)))
+        await asyncio.sleep(0.05)
+        owner.cancel()
+        result = await waiter
+        assert owner.cancelled()
+        assert result['success']
+        assert server.stats['coalesced'] == 1
+        assert server._pending == 0 and not server._inflight
+
+    run(scenario)
+
+
+def test_broken_pool_is_replaced_once_and_warmed_up():
+    async def scenario(server):
+        loop = asyncio.get_running_loop()
+        broken = server._executor
+        pid = await loop.run_in_executor(broken, _ping)
+        created = []
+        new_executor = server._new_executor
+
+        def counting():
+            created.append(new_executor())
+            return created[-1]
+
+        server._new_executor = counting
+        requests = [asyncio.ensure_future(server.solve(dict(spec))) for spec in (SPEC, OTHER)]
+        await asyncio.sleep(0.05)
+        os.kill(pid, signal.SIGKILL)
+        results = await asyncio.gather(*requests)
+        assert [r['success'] for r in results] == [False, False]
+        assert len(created) == 1 and server._executor is created[0]
+        # El pool nuevo ya está caliente y resuelve
+        assert (await server.solve(dict(SPEC)))['success']
+
+    run(scenario)
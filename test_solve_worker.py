@@ -0,0 +1,46 @@
+"""Pruebas del subproceso trabajador con límite de tiempo y cancelación"""
+
+import threading
+
+import pytest
+
+from solve_worker import SolveCancelled, SolveTimeout, SolveWorker
+
+
+SLOW = "y'' = sin(y)*exp(y') + x**3*y'**2"
+
+
+@pytest.fixture
+def worker():
+    worker = SolveWorker()
+    yield worker
+    worker.close()
+
+
+def test_cancel_after_result_keeps_result_and_process(worker):
+    result = worker.call('solve_linear', ("dy/dx + y = x",))
+    pid = worker._process.pid
+    assert result['success']
+    assert worker.cancel() is False
+    assert worker.call('solve_linear', ("dy/dx + y = 2*x",))['success']
+    assert worker._process.pid == pid
+
+
+def test_cancel_running_job(worker):
+    job = worker.new_job()
+    threading.Timer(0.5, worker.cancel, args=(job,)).start()
+    with pytest.raises(SolveCancelled):
+        worker.call('solve_general', (SLOW,), job=job)
+
+
+def test_cancel_pending_job_does_not_affect_others(worker):
+    job = worker.new_job()
+    assert worker.cancel(job) is True
+    with pytest.raises(SolveCancelled):
+        worker.call('solve_linear', ("dy/dx + y = x",), job=job)
+    assert worker.call('solve_linear', ("dy/dx + y = x",))['success']
+
+
+def test_timeout(worker):
+    with pytest.raises(SolveTimeout):
+        worker.call('solve_general', (SLOW,), timeout=0.5)